@@ -0,0 +1,172 @@
+import io
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import wave
+
+PLAYER_COMMANDS = (
+    ("pw-play", "-"),
+    ("paplay",),
+    ("aplay", "-q", "-"),
+)
+
+
+class Sound:
+    def __init__(self, data):
+        self.data = data
+        with wave.open(io.BytesIO(data), "rb") as reader:
+            self.channels = reader.getnchannels()
+            self.sample_width = reader.getsampwidth()
+            self.rate = reader.getframerate()
+            self.frames = reader.readframes(reader.getnframes())
+        self.duration = len(self.frames) / (
+            self.channels * self.sample_width * self.rate
+        )
+
+
+def load_wav(path):
+    with open(path, "rb") as f:
+        return Sound(f.read())
+
+
+def has_alsa_device():
+    try:
+        with open("/proc/asound/cards", "r") as f:
+            return "no soundcards" not in f.read()
+    except OSError:
+        return False
+
+
+class NullBackend:
+    name = "none"
+
+    def play(self, sound):
+        pass
+
+    def beep(self):
+        pass
+
+
+class WinsoundBackend:
+    name = "winsound"
+
+    def __init__(self, winsound):
+        self.winsound = winsound
+
+    def play(self, sound):
+        self.winsound.PlaySound(
+            sound.data, self.winsound.SND_MEMORY | self.winsound.SND_NODEFAULT
+        )
+
+    def beep(self):
+        self.winsound.MessageBeep(self.winsound.MB_ICONINFORMATION)
+
+
+class SimpleaudioBackend:
+    name = "simpleaudio"
+
+    def __init__(self, simpleaudio):
+        self.simpleaudio = simpleaudio
+
+    def play(self, sound):
+        self.simpleaudio.play_buffer(
+            sound.frames, sound.channels, sound.sample_width, sound.rate
+        ).wait_done()
+
+    def beep(self):
+        pass
+
+
+class CommandBackend:
+    def __init__(self, command):
+        self.command = list(command)
+        self.name = command[0]
+
+    def play(self, sound):
+        subprocess.run(
+            self.command,
+            input=sound.data,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=sound.duration + 5,
+            check=True,
+        )
+
+    def beep(self):
+        pass
+
+
+def detect_backend():
+    if sys.platform == "win32":
+        try:
+            import winsound
+
+            return WinsoundBackend(winsound)
+        except ImportError:
+            pass
+
+    try:
+        import simpleaudio
+
+        return SimpleaudioBackend(simpleaudio)
+    except ImportError:
+        pass
+
+    for command in PLAYER_COMMANDS:
+        if shutil.which(command[0]) is None:
+            continue
+        if command[0] == "aplay" and not has_alsa_device():
+            continue
+        return CommandBackend(command)
+    return NullBackend()
+
+
+class AlertSound:
+    def __init__(self, path=None, backend=None, max_failures=3):
+        self.backend = backend or detect_backend()
+        self.sound = None
+        self.max_failures = max_failures
+        self.failures = 0
+        self._playing = threading.Lock()
+        if path is not None:
+            self.load(path)
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return False
+        try:
+            self.sound = load_wav(path)
+            return True
+        except Exception as e:
+            print(f"Error loading alert sound {path}: {e}")
+            return False
+
+    def play(self):
+        if isinstance(self.backend, NullBackend):
+            return False
+        if not self._playing.acquire(blocking=False):
+            return False
+        thread = threading.Thread(target=self._run, name="alert-sound", daemon=True)
+        thread.start()
+        return True
+
+    def _run(self):
+        try:
+            if self.sound is not None:
+                self.backend.play(self.sound)
+            else:
+                self.backend.beep()
+            self.failures = 0
+        except Exception as e:
+            self.failures += 1
+            print(f"Error playing alert sound via {self.backend.name}: {e}")
+            if self.failures >= self.max_failures:
+                print(
+                    f"Alert sound failed {self.failures} times in a row via "
+                    f"{self.backend.name}, muting"
+                )
+                self.backend = NullBackend()
+        finally:
+            self._playing.release()
@@ -0,0 +1,113 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from bars import Bars
+
+PERIOD_ROWS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 21,
+    "3mo": 63,
+    "6mo": 126,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+    "10y": 2520,
+}
+
+
+def dedupe_bars(days, closes):
+    order = np.argsort(days, kind="stable")
+    days = days[order]
+    closes = closes[order]
+    keep = np.ones(len(days), dtype=bool)
+    keep[:-1] = days[1:] != days[:-1]
+    return days[keep], closes[keep]
+
+
+class BarStore:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def path(self, symbol):
+        name = "".join(ch if ch.isalnum() else "_" for ch in symbol.lstrip("^"))
+        return self.directory / f"{name}.npz"
+
+    def load(self, symbol):
+        path = self.path(symbol)
+        if not path.exists():
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        try:
+            with np.load(path) as data:
+                return data["days"], data["closes"]
+        except Exception as e:
+            print(f"Error loading {symbol} bars from {path}: {e}")
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+    def save(self, symbol, days, closes):
+        path = self.path(symbol)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    days=np.asarray(days, dtype=np.int32),
+                    closes=np.asarray(closes, dtype=np.float64),
+                )
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"Error saving {symbol} bars to {path}: {e}")
+            return False
+
+    def merge(self, symbol, days, closes):
+        old_days, old_closes = self.load(symbol)
+        days, closes = dedupe_bars(
+            np.concatenate([old_days.astype(np.int64), np.asarray(days, np.int64)]),
+            np.concatenate([old_closes, np.asarray(closes, np.float64)]),
+        )
+        self.save(symbol, days, closes)
+        return len(days)
+
+
+class StoreTicker:
+    def __init__(self, provider, symbol):
+        self.provider = provider
+        self.symbol = symbol
+
+    def history(self, period=None, start=None, end=None, interval="1d", **kwargs):
+        bars = self.provider.bars(self.symbol)
+        if interval != "1d":
+            return bars[:0]
+        if start is not None or end is not None:
+            lo = 0 if start is None else np.searchsorted(bars.days, start.toordinal())
+            hi = (
+                len(bars)
+                if end is None
+                else np.searchsorted(bars.days, end.toordinal())
+            )
+            return bars[lo:hi]
+        if period is None or period == "max":
+            return bars
+        return bars[-PERIOD_ROWS[period] :]
+
+
+class StoreProvider:
+    def __init__(self, store):
+        self.store = store
+        self.loaded = {}
+
+    def bars(self, symbol):
+        path = self.store.path(symbol)
+        mtime = path.stat().st_mtime_ns if path.exists() else None
+        cached = self.loaded.get(symbol)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, Bars(*self.store.load(symbol)))
+            self.loaded[symbol] = cached
+        return cached[1]
+
+    def Ticker(self, symbol):
+        return StoreTicker(self, symbol)
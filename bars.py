@@ -0,0 +1,58 @@
+import numpy as np
+
+EPOCH_ORDINAL = 719163
+
+
+def day_ordinals(index):
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+
+
+class Bars:
+    __slots__ = ("days", "closes")
+
+    def __init__(self, days, closes):
+        self.days = np.asarray(days, dtype=np.int64)
+        self.closes = np.asarray(closes, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.closes)
+
+    def __getitem__(self, key):
+        return Bars(self.days[key], self.closes[key])
+
+    @property
+    def empty(self):
+        return len(self.closes) == 0
+
+    def last(self, offset=1):
+        if len(self.closes) < offset:
+            return None
+        return float(self.closes[-offset])
+
+    def key(self):
+        return (int(self.days[-1]), len(self.closes), float(self.closes[-1]))
+
+    def fingerprint(self):
+        if len(self.closes) == 0:
+            return None
+        return (
+            len(self.closes),
+            int(self.days[0]),
+            int(self.days[-1]),
+            float(self.closes[-1]),
+            self.last(2),
+        )
+
+    def dropna(self):
+        valid = np.isfinite(self.closes)
+        return self if valid.all() else self[valid]
+
+
+def as_bars(data):
+    if data is None or isinstance(data, Bars):
+        return data
+    if data.empty:
+        return Bars(np.empty(0, dtype=np.int64), np.empty(0))
+    return Bars(day_ordinals(data.index), data["Close"].to_numpy(dtype=np.float64))
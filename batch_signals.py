@@ -0,0 +1,311 @@
+import concurrent.futures
+import os
+from collections import defaultdict
+from multiprocessing import shared_memory
+
+import numpy as np
+
+ACTIONS = ("STRONG BUY", "BUY", "MODERATE BUY", "WATCH", "WAIT")
+ACTION_COLORS = ("#22c55e", "#22c55e", "#84cc16", "#eab308", "#6b7280")
+CROSSOVERS = {"bullish": 1, "neutral": 0, "bearish": -1}
+SCORE_FIELDS = ("entry_score", "confidence", "entry_signals", "action")
+SCORE_DTYPES = (np.int16, np.int16, np.int8, np.int8)
+INPUT_ROWS = 7
+
+RATIO_TEXT = (
+    (1.10, "[ENTRY] Extreme fear - Prime contrarian setup"),
+    (1.05, "[ENTRY] High fear - Strong entry signal"),
+    (1.00, "[ENTRY] Elevated fear - Entry signal"),
+    (0.95, "[WATCH] Neutral fear levels"),
+    (float("-inf"), "[WAIT] Low fear - No contrarian edge"),
+)
+RSI_TEXT = (
+    (30, "[ENTRY] RSI Oversold - Strong entry"),
+    (40, "[ENTRY] RSI Approaching oversold"),
+    (50, "[WATCH] RSI Neutral-low"),
+    (70, "[WATCH] RSI Neutral-high"),
+    (float("inf"), "[WAIT] RSI Overbought - Wait"),
+)
+MACD_TEXT = {
+    1: "[ENTRY] MACD Bullish - Momentum confirmed",
+    0: "[WATCH] MACD Neutral",
+    -1: "[WAIT] MACD Bearish - Wait for turn",
+}
+
+
+def _group_by_length(series_list):
+    groups = defaultdict(list)
+    for i, series in enumerate(series_list):
+        groups[len(series)].append(i)
+    for length, indexes in groups.items():
+        matrix = np.empty((length, len(indexes)), dtype=np.float64)
+        for column, i in enumerate(indexes):
+            matrix[:, column] = series_list[i]
+        yield indexes, matrix
+
+
+def rsi_matrix(prices, period=14):
+    if prices.shape[0] < period + 1:
+        return np.full(prices.shape[1], np.nan)
+
+    deltas = np.diff(prices, axis=0)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    avg_gain = gains[:period].sum(axis=0) / period
+    avg_loss = losses[:period].sum(axis=0) / period
+    for i in range(period, deltas.shape[0]):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return np.where(avg_loss == 0, 100.0, rsi)
+
+
+def ema_matrix(data, period):
+    multiplier = 2 / (period + 1)
+    ema = np.empty((data.shape[0] - period + 1, data.shape[1]))
+    ema[0] = data[:period].sum(axis=0) / period
+    for i in range(period, data.shape[0]):
+        row = i - period + 1
+        ema[row] = (data[i] - ema[row - 1]) * multiplier + ema[row - 1]
+    return ema
+
+
+def macd_matrix(prices):
+    columns = prices.shape[1]
+    if prices.shape[0] < 26:
+        return np.full(columns, np.nan), np.full(columns, np.nan)
+
+    ema_12 = ema_matrix(prices, 12)
+    ema_26 = ema_matrix(prices, 26)
+    macd_series = ema_12[14:] - ema_26
+
+    if macd_series.shape[0] < 9:
+        return macd_series[-1], np.full(columns, np.nan)
+    return macd_series[-1], ema_matrix(macd_series, 9)[-1]
+
+
+def ma_matrix(prices, period=200):
+    if prices.shape[0] < period:
+        return np.full(prices.shape[1], np.nan)
+    return prices[-period:].sum(axis=0) / period
+
+
+def indicators_batch(series_list, rsi_period=14, ma_period=200):
+    count = len(series_list)
+    last = np.full(count, np.nan)
+    rsi = np.full(count, np.nan)
+    macd_line = np.full(count, np.nan)
+    signal_line = np.full(count, np.nan)
+    ma = np.full(count, np.nan)
+
+    for indexes, prices in _group_by_length(series_list):
+        if prices.shape[0] == 0:
+            continue
+        last[indexes] = prices[-1]
+        rsi[indexes] = rsi_matrix(prices, rsi_period)
+        macd_line[indexes], signal_line[indexes] = macd_matrix(prices)
+        ma[indexes] = ma_matrix(prices, ma_period)
+
+    crossover = np.zeros(count, dtype=np.int8)
+    crossover[macd_line > signal_line] = 1
+    crossover[macd_line < signal_line] = -1
+
+    return {
+        "last": last,
+        "rsi": rsi,
+        "macd_line": macd_line,
+        "signal_line": signal_line,
+        "crossover": crossover,
+        "ma": ma,
+        "above_ma": ~np.isnan(ma) & (last > ma),
+    }
+
+
+def _optional(values, shape):
+    if values is None:
+        return np.full(shape, np.nan)
+    return np.asarray(values, dtype=np.float64)
+
+
+def score_batch(
+    ratio,
+    rsi,
+    crossover,
+    above_ma200,
+    ratio_zscore=None,
+    return_zscore=None,
+    term_inversion=None,
+):
+    ratio = np.asarray(ratio, dtype=np.float64)
+    rsi = np.asarray(rsi, dtype=np.float64)
+    crossover = np.asarray(crossover)
+    above = np.asarray(above_ma200, dtype=bool)
+    ratio_zscore = _optional(ratio_zscore, ratio.shape)
+    return_zscore = _optional(return_zscore, ratio.shape)
+    term_inversion = _optional(term_inversion, ratio.shape)
+
+    rsi_valid = ~np.isnan(rsi)
+    bullish = crossover == 1
+    neutral = crossover == 0
+
+    entry_score = np.select(
+        [ratio >= 1.10, ratio >= 1.05, ratio >= 1.00, ratio >= 0.95],
+        [40, 35, 25, 10],
+        0,
+    )
+    entry_score += np.where(
+        rsi_valid,
+        np.select([rsi < 30, rsi < 40, rsi < 50, rsi < 70], [30, 20, 10, 5], 0),
+        0,
+    )
+    entry_score += np.select([bullish, neutral], [20, 5], 0)
+    entry_score += np.where(above, 20, 5)
+    entry_score = np.clip(entry_score, 0, 100)
+
+    entry_signals = (
+        (ratio >= 1.00).astype(np.int64) + (rsi_valid & (rsi < 40)) + bullish + above
+    )
+
+    confidence = 50 + np.select(
+        [ratio >= 1.10, ratio >= 1.00, ratio >= 0.95], [20, 10, 5], -5
+    )
+    confidence += np.where(
+        rsi_valid,
+        np.select([rsi < 30, rsi < 40, rsi < 50, rsi < 70], [20, 15, 5, 0], -10),
+        0,
+    )
+    confidence += np.select([bullish, neutral], [15, 5], -5)
+    confidence += np.where(above, 15, -10)
+    confidence += np.select([ratio_zscore >= 2, ratio_zscore <= -1], [10, -5], 0)
+    confidence += np.where(return_zscore <= -2, 5, 0)
+    confidence += np.where(term_inversion >= 0.05, 5, 0)
+    confidence += np.select(
+        [entry_signals >= 3, entry_signals >= 2, entry_signals >= 1], [20, 10, 5], -15
+    )
+    confidence = np.clip(confidence, 0, 100)
+
+    action = np.select(
+        [
+            (entry_score >= 85) & (entry_signals >= 3) & (confidence >= 70),
+            (entry_score >= 65) & (entry_signals >= 2) & (confidence >= 60),
+            (entry_score >= 50) & (confidence >= 70),
+            (entry_score >= 40) | (confidence >= 50),
+        ],
+        [0, 1, 2, 3],
+        4,
+    ).astype(np.int8)
+
+    return {
+        "entry_score": entry_score.astype(np.int16),
+        "confidence": confidence.astype(np.int16),
+        "entry_signals": entry_signals.astype(np.int8),
+        "action": action,
+    }
+
+
+def signal_text(ratio, rsi, crossover, above_ma200):
+    signals = [next(text for level, text in RATIO_TEXT if ratio >= level)]
+    if rsi is not None and not np.isnan(rsi):
+        signals.append(next(text for level, text in RSI_TEXT if rsi < level))
+    signals.append(MACD_TEXT[int(crossover)])
+    if above_ma200:
+        signals.append("[ENTRY] Above 200-MA - Bull trend")
+    else:
+        signals.append("[WATCH] Below 200-MA - Caution")
+    return signals
+
+
+def _score_chunk(input_name, output_name, count, start, stop):
+    inputs_shm = shared_memory.SharedMemory(name=input_name)
+    outputs_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        inputs = np.ndarray(
+            (INPUT_ROWS, count), dtype=np.float64, buffer=inputs_shm.buf
+        )
+        outputs = np.ndarray((4, count), dtype=np.int16, buffer=outputs_shm.buf)
+        chunk = inputs[:, start:stop]
+        scores = score_batch(chunk[0], chunk[1], chunk[2], chunk[3] != 0, *chunk[4:])
+        for row, field in enumerate(SCORE_FIELDS):
+            outputs[row, start:stop] = scores[field]
+        del inputs, outputs, chunk
+        return stop - start
+    finally:
+        inputs_shm.close()
+        outputs_shm.close()
+
+
+def score_parallel(
+    ratio,
+    rsi,
+    crossover,
+    above_ma200,
+    ratio_zscore=None,
+    return_zscore=None,
+    term_inversion=None,
+    workers=None,
+    chunk_size=250000,
+    executor=None,
+):
+    count = len(ratio)
+    workers = workers or os.cpu_count() or 1
+    if executor is None and (workers <= 1 or count <= chunk_size):
+        return score_batch(
+            ratio,
+            rsi,
+            crossover,
+            above_ma200,
+            ratio_zscore,
+            return_zscore,
+            term_inversion,
+        )
+
+    inputs_shm = shared_memory.SharedMemory(
+        create=True, size=max(1, 8 * INPUT_ROWS * count)
+    )
+    outputs_shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * count))
+    owns_executor = executor is None
+    try:
+        inputs = np.ndarray(
+            (INPUT_ROWS, count), dtype=np.float64, buffer=inputs_shm.buf
+        )
+        inputs[0] = ratio
+        inputs[1] = rsi
+        inputs[2] = crossover
+        inputs[3] = above_ma200
+        inputs[4] = _optional(ratio_zscore, count)
+        inputs[5] = _optional(return_zscore, count)
+        inputs[6] = _optional(term_inversion, count)
+
+        if owns_executor:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        futures = [
+            executor.submit(
+                _score_chunk,
+                inputs_shm.name,
+                outputs_shm.name,
+                count,
+                start,
+                min(start + chunk_size, count),
+            )
+            for start in range(0, count, chunk_size)
+        ]
+        for future in futures:
+            future.result()
+
+        outputs = np.ndarray((4, count), dtype=np.int16, buffer=outputs_shm.buf)
+        results = {
+            field: outputs[row].astype(dtype)
+            for row, (field, dtype) in enumerate(zip(SCORE_FIELDS, SCORE_DTYPES))
+        }
+        del inputs, outputs
+        return results
+    finally:
+        if owns_executor and executor is not None:
+            executor.shutdown()
+        inputs_shm.close()
+        inputs_shm.unlink()
+        outputs_shm.close()
+        outputs_shm.unlink()
@@ -0,0 +1,461 @@
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bar_store import PERIOD_ROWS
+from bars import as_bars
+from batch_signals import score_parallel
+from indicator_cache import INDICATOR_CACHE
+from monitor import ContrarianMonitor, align_ratio_history
+from scanner import UniverseScanner
+from term_structure import TERM_CACHE, align_term_structure, term_metrics
+
+BENCHMARK_DIR = Path("benchmarks")
+DATA_DIR = BENCHMARK_DIR / "data"
+RESULTS_DIR = BENCHMARK_DIR / "results"
+
+SYMBOLS = ("^VIX", "^VIX3M", "^GSPC", "^VIX9D", "^VIX6M", "^VIX1Y")
+
+
+def generate_synthetic_dataset(days=1300, seed=26):
+    rng = random.Random(seed)
+    index = pd.bdate_range(end="2025-06-30", periods=days, tz="America/New_York")
+
+    spx = 3200.0
+    vix = 18.0
+    vix3m = 20.0
+    spx_closes = []
+    vix_closes = []
+    vix3m_closes = []
+
+    for _ in range(days):
+        shock = rng.gauss(0, 1)
+        spike = rng.random() < 0.01
+        spx *= math.exp(0.0003 + 0.011 * shock - (0.06 if spike else 0.0))
+        vix += 0.08 * (18.0 - vix) - 1.4 * shock + (12.0 if spike else 0.0)
+        vix = max(9.0, vix)
+        vix3m += 0.04 * (20.0 - vix3m) + 0.35 * (vix - vix3m) * 0.2
+        vix3m = max(11.0, vix3m + rng.gauss(0, 0.3))
+        spx_closes.append(round(spx, 2))
+        vix_closes.append(round(vix, 2))
+        vix3m_closes.append(round(vix3m, 2))
+
+    vix_array = np.array(vix_closes)
+    vix3m_array = np.array(vix3m_closes)
+    curve = {
+        "^VIX9D": np.maximum(8.0, vix_array + 0.6 * (vix_array - vix3m_array)),
+        "^VIX6M": 0.6 * vix3m_array + 0.4 * 21.0,
+        "^VIX1Y": 0.4 * vix3m_array + 0.6 * 22.0,
+    }
+
+    frames = {
+        "^GSPC": pd.DataFrame({"Close": spx_closes}, index=index),
+        "^VIX": pd.DataFrame({"Close": vix_closes}, index=index),
+        "^VIX3M": pd.DataFrame({"Close": vix3m_closes}, index=index),
+    }
+    for symbol, closes in curve.items():
+        frames[symbol] = pd.DataFrame({"Close": closes.round(2)}, index=index)
+    return frames
+
+
+def load_recorded_dataset(name):
+    path = DATA_DIR / f"{name}.json"
+    with open(path, "r") as f:
+        payload = json.load(f)
+
+    frames = {}
+    for symbol, series in payload["symbols"].items():
+        index = pd.DatetimeIndex(pd.to_datetime(series["dates"], utc=True))
+        index = index.tz_convert("America/New_York")
+        frames[symbol] = pd.DataFrame({"Close": series["close"]}, index=index)
+    return frames
+
+
+def record_dataset(name, period="5y"):
+    import yfinance as yf
+
+    symbols = {}
+    for symbol in SYMBOLS:
+        data = yf.Ticker(symbol).history(period=period)
+        if data.empty:
+            raise ValueError(f"No data available for {symbol}")
+        symbols[symbol] = {
+            "dates": [ts.isoformat() for ts in data.index],
+            "close": [float(v) for v in data["Close"].tolist()],
+        }
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    path = DATA_DIR / f"{name}.json"
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "recorded": datetime.now().isoformat(timespec="seconds"),
+                "period": period,
+                "symbols": symbols,
+            },
+            f,
+        )
+    return path
+
+
+class ReplayTicker:
+    def __init__(self, provider, symbol):
+        self.provider = provider
+        self.symbol = symbol
+
+    def history(self, period=None, start=None, end=None, interval="1d"):
+        if self.provider.latency:
+            time.sleep(self.provider.latency)
+        frame = self.provider.frames.get(self.symbol)
+        if frame is None:
+            return pd.DataFrame(columns=["Close"])
+
+        if self.provider.as_of is not None:
+            frame = frame[frame.index <= self.provider.as_of]
+
+        if start is not None or end is not None:
+            tz = frame.index.tz
+            if start is not None:
+                frame = frame[frame.index >= pd.Timestamp(start).tz_localize(tz)]
+            if end is not None:
+                frame = frame[frame.index < pd.Timestamp(end).tz_localize(tz)]
+            return frame
+
+        if period is None or period == "max":
+            return frame
+        if interval != "1d" and period.endswith("d") and len(frame) > 0:
+            cutoff = frame.index[-1] - pd.Timedelta(days=int(period[:-1]))
+            return frame[frame.index > cutoff]
+        return frame.iloc[-PERIOD_ROWS[period] :]
+
+
+class ReplayProvider:
+    def __init__(self, frames, as_of=None, latency=0.0):
+        self.frames = frames
+        self.as_of = as_of
+        self.latency = latency
+
+    def Ticker(self, symbol):
+        return ReplayTicker(self, symbol)
+
+
+class OfflineMonitor(ContrarianMonitor):
+    def load_credentials(self):
+        self.bot_token = None
+        self.chat_id = None
+        self.api_url = None
+
+    def send_telegram_notification(self, *args, **kwargs):
+        return True
+
+
+def measure(func, repeat, min_time=0.05):
+    func()
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 16:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) * 1000 / number)
+
+    return {
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "repeat": repeat,
+        "loops": number,
+    }
+
+
+def build_cases(frames):
+    monitor = OfflineMonitor(provider=ReplayProvider(frames))
+
+    spy_prices = frames["^GSPC"]["Close"].tolist()[-252:]
+    spy_price = spy_prices[-1]
+
+    start = frames["^VIX"].index[-1] - pd.Timedelta(days=75)
+    vix_hist = frames["^VIX"][frames["^VIX"].index >= start]
+    vix3m_hist = frames["^VIX3M"][frames["^VIX3M"].index >= start]
+    all_dates, all_ratios = align_ratio_history(
+        frames["^VIX"], frames["^VIX3M"], limit=len(frames["^VIX"])
+    )
+
+    scoring_grid = [
+        (ratio, rsi, crossover, above)
+        for ratio in (0.85, 0.97, 1.02, 1.07, 1.15)
+        for rsi in (None, 25, 35, 45, 60, 75)
+        for crossover in ("bullish", "neutral", "bearish")
+        for above in (True, False)
+    ]
+
+    def bench_rsi():
+        monitor.calculate_rsi(spy_prices, 14)
+
+    def bench_macd():
+        monitor.calculate_macd(spy_prices)
+
+    def bench_ma200():
+        monitor.calculate_ma(spy_prices, period=200)
+
+    def bench_scoring():
+        for ratio, rsi, crossover, above in scoring_grid:
+            monitor.calculate_enhanced_signal(
+                ratio, 20.0, rsi, crossover, above, spy_price, spy_price * 0.95
+            )
+
+    def bench_alignment():
+        align_ratio_history(vix_hist, vix3m_hist, limit=60)
+
+    curve_bars = {symbol: as_bars(frame) for symbol, frame in frames.items()}
+    _, term_curve = align_term_structure(curve_bars)
+
+    def bench_term_alignment():
+        align_term_structure(curve_bars)
+
+    def bench_term_metrics():
+        term_metrics(term_curve)
+
+    noise = np.random.default_rng(30).normal(0, 0.004, size=(300, 252))
+    base = np.asarray(spy_prices)
+    universe = [{"name": f"SYN{i}", "underlying": f"SYN{i}"} for i in range(300)]
+    universe_closes = {
+        f"SYN{i}": base * np.exp(np.cumsum(noise[i])) for i in range(300)
+    }
+    scanner = UniverseScanner(universe, provider=ReplayProvider(frames))
+
+    def bench_scanner():
+        scanner.scan(universe_closes)
+
+    def bench_cycle():
+        monitor.last_signal = None
+        monitor.market_memo = None
+        monitor.signal_memo = None
+        INDICATOR_CACHE.clear()
+        TERM_CACHE.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            monitor.check_and_notify()
+
+    def bench_cycle_unchanged():
+        with contextlib.redirect_stdout(io.StringIO()):
+            monitor.check_and_notify()
+
+    slow_monitor = OfflineMonitor(provider=ReplayProvider(frames, latency=0.05))
+
+    def bench_cycle_latency():
+        with contextlib.redirect_stdout(io.StringIO()):
+            slow_monitor.check_and_notify()
+
+    def bench_cycle_latency_async():
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(slow_monitor.check_and_notify_async())
+
+    cases = {
+        "indicators.rsi": bench_rsi,
+        "indicators.macd": bench_macd,
+        "indicators.ma200": bench_ma200,
+        "scoring.enhanced_signal_x180": bench_scoring,
+        "fetch.align_ratio_history": bench_alignment,
+        "term.align_curve_5y": bench_term_alignment,
+        "term.metrics_5y": bench_term_metrics,
+        "monitor.check_and_notify": bench_cycle,
+        "monitor.check_and_notify_unchanged": bench_cycle_unchanged,
+        "monitor.cycle_50ms_fetch_sync": bench_cycle_latency,
+        "monitor.cycle_50ms_fetch_async": bench_cycle_latency_async,
+        "scanner.scan_x300": bench_scanner,
+    }
+
+    try:
+        logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import matplotlib.pyplot as plt
+
+        from contrarian_edge import build_ratio_figure, render_ratio_chart
+
+        chart_ratios = all_ratios[-60:]
+        chart_dates = all_dates[-60:]
+
+        def bench_chart():
+            fig, _ = build_ratio_figure(chart_ratios, chart_dates, "Dark")
+            FigureCanvasAgg(fig).draw()
+            plt.close(fig)
+
+        long_ratios = all_ratios[-1260:]
+        long_dates = all_dates[-1260:]
+
+        def bench_chart_long():
+            fig, _ = build_ratio_figure(long_ratios, long_dates, "Dark", max_points=900)
+            FigureCanvasAgg(fig).draw()
+            plt.close(fig)
+
+        def bench_chart_rgba():
+            render_ratio_chart(long_ratios, long_dates, "Dark", width=900)
+
+        cases["chart.update_chart_agg"] = bench_chart
+        cases["chart.render_rgba_5y"] = bench_chart_rgba
+        cases["chart.update_chart_agg_5y"] = bench_chart_long
+    except Exception as e:
+        print(f"Skipping chart benchmark: {e}")
+
+    return cases
+
+
+def run_benchmarks(frames, dataset, repeat, only=None):
+    results = {}
+    for name, func in build_cases(frames).items():
+        if only and only not in name:
+            continue
+        results[name] = measure(func, repeat)
+        print(f"{name:<34} {results[name]['median_ms']:>10.4f} ms")
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "dataset": dataset,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def run_scaling_benchmark(rows, max_workers, repeat):
+    rng = np.random.default_rng(40)
+    ratio = rng.uniform(0.80, 1.25, rows)
+    rsi = rng.uniform(10, 90, rows)
+    crossover = rng.integers(-1, 2, rows)
+    above = rng.random(rows) > 0.5
+    chunk_size = max(10000, rows // (max_workers * 4))
+
+    print(f"Scoring {rows:,} rows in chunks of {chunk_size:,}")
+    print(f"{'workers':>7} {'median':>12} {'speedup':>8}")
+    results = {}
+    for workers in range(1, max_workers + 1):
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+
+            def score():
+                score_parallel(
+                    ratio,
+                    rsi,
+                    crossover,
+                    above,
+                    chunk_size=chunk_size,
+                    executor=executor,
+                )
+
+            results[workers] = measure(score, repeat, min_time=0)
+        speedup = results[1]["median_ms"] / results[workers]["median_ms"]
+        print(f"{workers:>7} {results[workers]['median_ms']:>9.1f} ms {speedup:>7.2f}x")
+    return results
+
+
+def compare_results(latest, baseline, threshold):
+    regressions = []
+    print()
+    print(f"{'benchmark':<34} {'baseline':>10} {'latest':>10} {'change':>9}")
+    for name, result in latest["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<34} {'--':>10} {result['median_ms']:>10.4f}       new")
+            continue
+
+        change = result["median_ms"] / base["median_ms"] - 1
+        marker = ""
+        if change > threshold:
+            marker = " REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            marker = " faster"
+        print(
+            f"{name:<34} {base['median_ms']:>10.4f} {result['median_ms']:>10.4f} "
+            f"{change * 100:>+8.1f}%{marker}"
+        )
+
+    if latest.get("dataset") != baseline.get("dataset"):
+        print(
+            f"Warning: baseline dataset '{baseline.get('dataset')}' differs from "
+            f"'{latest.get('dataset')}'"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contrarian Edge benchmark suite")
+    parser.add_argument("--dataset", default="synthetic")
+    parser.add_argument("--record", metavar="NAME")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--only")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "latest.json"))
+    parser.add_argument("--baseline", default=str(RESULTS_DIR / "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--scaling", type=int, metavar="ROWS")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if args.scaling:
+        run_scaling_benchmark(args.scaling, args.max_workers, args.repeat)
+        return 0
+
+    if args.record:
+        path = record_dataset(args.record)
+        print(f"Recorded dataset written to {path}")
+        return 0
+
+    if args.dataset == "synthetic":
+        frames = generate_synthetic_dataset()
+    else:
+        frames = load_recorded_dataset(args.dataset)
+
+    latest = run_benchmarks(frames, args.dataset, args.repeat, args.only)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(latest, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(latest, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    if baseline_path.exists():
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_results(latest, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class SystemClock:
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def now(self, tz=None):
+        return datetime.now(tz)
+
+    def sleep(self, seconds, stop_event=None):
+        if stop_event is not None:
+            return stop_event.wait(max(0.0, seconds))
+        time.sleep(max(0.0, seconds))
+        return False
+
+
+class SimulatedClock:
+    def __init__(self, start=0.0):
+        self.current = float(start)
+        self.sleeps = 0
+        self.slept = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.current
+
+    def monotonic(self):
+        return self.current
+
+    def now(self, tz=None):
+        return datetime.fromtimestamp(self.current, tz)
+
+    def advance(self, seconds):
+        with self._lock:
+            self.current += max(0.0, seconds)
+            return self.current
+
+    def advance_to(self, timestamp):
+        with self._lock:
+            self.current = max(self.current, float(timestamp))
+            return self.current
+
+    def sleep(self, seconds, stop_event=None):
+        if stop_event is not None and stop_event.is_set():
+            return True
+        with self._lock:
+            self.sleeps += 1
+            self.slept += max(0.0, seconds)
+            self.current += max(0.0, seconds)
+        return False
+
+
+class Schedule:
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_due = None
+        self.overruns = 0
+
+    def due_in(self):
+        if self.next_due is None:
+            return 0.0
+        return max(0.0, self.next_due - get_clock().monotonic())
+
+    def mark_run(self):
+        now = get_clock().monotonic()
+        if self.next_due is None:
+            self.next_due = now
+        self.next_due += self.interval
+        if self.next_due <= now:
+            self.overruns += 1
+            self.next_due = now + self.interval
+        return self.next_due - now
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    global _clock
+    previous = _clock
+    _clock = clock
+    return previous
+
+
+@contextmanager
+def use_clock(clock):
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -1,21 +1,50 @@
 import customtkinter as ctk
+import tkinter
 import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import date, datetime
 import threading
-from collections import deque
 import time
 import gc
 import concurrent.futures
-from functools import lru_cache
-import winsound
-import os
 import sys
 import requests
 import json
 from pathlib import Path
 
+import numpy as np
+from PIL import Image, ImageTk
+
+from audio import AlertSound
+from bars import as_bars
+from clock import Schedule, get_clock
+from data_quality import DATA_QUALITY
+from downsample import downsample_indices
+from indicator_cache import INDICATOR_CACHE, last_bar_key
+from memory_watchdog import MemoryWatchdog
+from intraday import epoch_seconds
+from monitor import input_fingerprint, ratio_bars
+from percentiles import PERCENTILE_WINDOWS
+from profiler import SamplingProfiler
+from recorder import FrameRecorder, RecordingProvider
+from resilience import Deadline, DeadlineExceeded, get_fetcher
+from snapshot import SnapshotStore
+from term_structure import latest_term_metrics
+from ring_buffer import CHART_HISTORY_CAPACITY, RatioHistory
+from rolling_stats import RollingStats, push_returns
+from signal_stream import SignalStreamClient
+
 _matplotlib_loaded = False
 
+CHART_RANGES = {
+    "60D": (60, "60-DAY"),
+    "1Y": (252, "1-YEAR"),
+    "5Y": (1260, "5-YEAR"),
+    "Max": (None, "FULL HISTORY"),
+}
+VIX3M_FIRST_DATE = datetime(2007, 12, 4).date()
+MARKER_POINT_LIMIT = 90
+PERCENTILE_MIN_HISTORY = 120
+
 
 class SecureConfigManager:
     def __init__(self):
@@ -32,6 +61,12 @@ class SecureConfigManager:
         default_config = {
             "telegram": {"enabled": False},
             "notifications": {"sound_enabled": True, "toast_enabled": True},
+            "diagnostics": {
+                "profiling": False,
+                "record_frames": False,
+                "memory_watchdog": False,
+            },
+            "chart": {"range": "60D", "background_render": True},
         }
 
         if self.config_file.exists():
@@ -68,6 +103,29 @@ class SecureConfigManager:
 
         return self.save_config()
 
+    def is_profiling_enabled(self):
+        return self.config.get("diagnostics", {}).get("profiling", False)
+
+    def is_recording_enabled(self):
+        return self.config.get("diagnostics", {}).get("record_frames", False)
+
+    def is_memory_watchdog_enabled(self):
+        return self.config.get("diagnostics", {}).get("memory_watchdog", False)
+
+    def get_chart_range(self):
+        chart_range = self.config.get("chart", {}).get("range", "60D")
+        return chart_range if chart_range in CHART_RANGES else "60D"
+
+    def update_chart_range(self, chart_range):
+        if "chart" not in self.config:
+            self.config["chart"] = {}
+
+        self.config["chart"]["range"] = chart_range
+        return self.save_config()
+
+    def is_background_render_enabled(self):
+        return self.config.get("chart", {}).get("background_render", True)
+
     def get_notification_settings(self):
         return self.config.get(
             "notifications", {"sound_enabled": True, "toast_enabled": True}
@@ -115,7 +173,7 @@ class TelegramNotificationSystem:
             return
 
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = get_clock().now().strftime("%Y-%m-%d %H:%M:%S")
 
             if signal_type == "STRONG BUY":
                 emoji = "🚨"
@@ -183,27 +241,15 @@ class NotificationSystem:
 
         self.sound_type = "file"
         self.custom_sound_file = None
+        self.alert_sound = AlertSound()
 
     def play_notification_sound(self):
         if not self.sound_enabled:
             return
-
-        try:
-            if self.custom_sound_file and os.path.exists(self.custom_sound_file):
-                winsound.PlaySound(
-                    self.custom_sound_file, winsound.SND_FILENAME | winsound.SND_ASYNC
-                )
-            else:
-                winsound.MessageBeep(winsound.MB_ICONINFORMATION)
-        except Exception as e:
-            print(f"Error playing notification sound: {e}")
-            try:
-                print("\a")
-            except:
-                pass
+        self.alert_sound.play()
 
     def set_custom_sound(self, file_path):
-        if os.path.exists(file_path):
+        if self.alert_sound.load(file_path):
             self.custom_sound_file = file_path
 
     def show_toast_notification(self, signal_type, confidence):
@@ -435,22 +481,196 @@ class SmoothScrollableFrame(ctk.CTkScrollableFrame):
 
 
 def load_matplotlib():
-    global _matplotlib_loaded, plt, FigureCanvasTkAgg, Figure
+    global _matplotlib_loaded, plt, FigureCanvasTkAgg, FigureCanvasAgg, Figure
     if not _matplotlib_loaded:
         import matplotlib
 
         matplotlib.use("Agg")
         import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
         from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         from matplotlib.figure import Figure
 
         _matplotlib_loaded = True
 
 
+def build_ratio_figure(ratios, dates, mode, max_points=None, width=900):
+    load_matplotlib()
+
+    current_mode = mode.lower()
+    text_color = "#ffffff" if current_mode == "dark" else "#000000"
+    grid_color = "#333333" if current_mode == "dark" else "#e0e0e0"
+    line_color = "#3b82f6"
+    bg_color = "#2b2b2b" if current_mode == "dark" else "#dbdbdb"
+
+    fig = Figure(figsize=(width / 90, 3.5), facecolor=bg_color, dpi=90)
+    ax = fig.add_subplot(111)
+    ax.set_facecolor(bg_color)
+
+    dates = list(dates)
+    total = len(dates)
+    x_vals = np.arange(total)
+    ratios = np.asarray(ratios, dtype=np.float64)
+    if max_points and total > max_points:
+        x_vals = downsample_indices(ratios, max_points)
+        ratios = ratios[x_vals]
+    show_markers = len(x_vals) <= MARKER_POINT_LIMIT
+
+    ax.fill_between(
+        x_vals,
+        ratios,
+        1.0,
+        where=ratios >= 1.0,
+        alpha=0.15,
+        color="#ef4444",
+        interpolate=show_markers,
+    )
+    ax.fill_between(
+        x_vals,
+        ratios,
+        1.0,
+        where=ratios < 1.0,
+        alpha=0.15,
+        color="#22c55e",
+        interpolate=show_markers,
+    )
+
+    ax.plot(
+        x_vals,
+        ratios,
+        color=line_color,
+        linewidth=2.5 if show_markers else 1.5,
+        marker="o" if show_markers else None,
+        markersize=5,
+        markerfacecolor=line_color,
+        markeredgecolor=bg_color,
+        markeredgewidth=1.5,
+        alpha=1.0,
+        zorder=3,
+        antialiased=True,
+    )
+
+    ax.axhline(y=1.0, color="#ef4444", linestyle="--", linewidth=2, alpha=0.6, zorder=2)
+
+    date_format = "%m/%d" if total <= 260 else "%m/%Y"
+    if total > 10:
+        tick_positions = list(range(0, total, total // 8))
+    else:
+        tick_positions = list(range(total))
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels(
+        [dates[i].strftime(date_format) for i in tick_positions],
+        rotation=45,
+        ha="right",
+    )
+
+    ax.set_xlabel(
+        "Date",
+        color=text_color,
+        fontsize=10,
+        fontfamily="Bahnschrift",
+        fontweight="600",
+        labelpad=10,
+    )
+    ax.set_ylabel(
+        "VIX/VIX3M Ratio",
+        color=text_color,
+        fontsize=10,
+        fontfamily="Bahnschrift",
+        fontweight="600",
+        labelpad=10,
+    )
+    ax.tick_params(axis="x", colors=text_color, labelsize=8, width=1, length=4)
+    ax.tick_params(axis="y", colors=text_color, labelsize=9, width=1, length=4)
+    ax.grid(True, alpha=0.2, color=grid_color, linewidth=1, linestyle="-", zorder=1)
+
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["bottom"].set_color(grid_color)
+    ax.spines["left"].set_color(grid_color)
+    ax.spines["bottom"].set_linewidth(1.5)
+    ax.spines["left"].set_linewidth(1.5)
+
+    ax.margins(x=0.02, y=0.1)
+
+    fig.tight_layout(pad=2.0, rect=[0, 0.03, 1, 1])
+
+    return fig, bg_color
+
+
+def render_ratio_chart(ratios, dates, mode, width=900):
+    fig, bg_color = build_ratio_figure(
+        ratios, dates, mode, max_points=width, width=width
+    )
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    return bytes(canvas.buffer_rgba()), canvas.get_width_height(), bg_color
+
+
+class FrameTimeMonitor:
+    def __init__(self, widget, interval_ms=16, window=3600):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.window = window
+        self.frame_times = []
+        self.blocks = {}
+        self.last_tick = None
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self.last_tick = time.perf_counter()
+        self.widget.after(self.interval_ms, self.tick)
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def tick(self):
+        if not self.running:
+            return
+        now = time.perf_counter()
+        self.frame_times.append((now - self.last_tick) * 1000)
+        if len(self.frame_times) > self.window:
+            del self.frame_times[: len(self.frame_times) - self.window]
+        self.last_tick = now
+        self.widget.after(self.interval_ms, self.tick)
+
+    def record_block(self, name, seconds):
+        count, total, worst = self.blocks.get(name, (0, 0.0, 0.0))
+        ms = seconds * 1000
+        self.blocks[name] = (count + 1, total + ms, max(worst, ms))
+
+    def summary(self):
+        lines = []
+        if self.frame_times:
+            frames = sorted(self.frame_times)
+            p95 = frames[int(len(frames) * 0.95) - 1]
+            late = sum(1 for f in frames if f > self.interval_ms * 2)
+            lines.append(
+                f"Frame time: {len(frames)} frames, "
+                f"mean {sum(frames) / len(frames):.1f} ms, p95 {p95:.1f} ms, "
+                f"max {frames[-1]:.1f} ms, {late} late"
+            )
+        for name, (count, total, worst) in sorted(self.blocks.items()):
+            lines.append(
+                f"Main thread {name}: {count} calls, "
+                f"mean {total / count:.1f} ms, max {worst:.1f} ms"
+            )
+        return lines
+
+
 class ContrarianEdgeApp(ctk.CTk):
-    def __init__(self):
+    def __init__(
+        self, profile=False, stream_url=None, record=False, memory_watchdog=False
+    ):
         super().__init__()
 
+        self.profiler = None
+        self.memory_watchdog = None
+        if profile:
+            self.profiler = SamplingProfiler("contrarian_edge").start()
+
         self.title("Contrarian Edge")
         self.geometry("900x930")
         self.minsize(900, 930)
@@ -739,7 +959,15 @@ class ContrarianEdgeApp(ctk.CTk):
             font=ctk.CTkFont(family="Bahnschrift", size=13),
             text_color=("#6b7280", "#9ca3af"),
         )
-        self.ratio_description.grid(row=4, column=0, padx=18, pady=(6, 18))
+        self.ratio_description.grid(row=4, column=0, padx=18, pady=(6, 0))
+
+        self.term_structure_label = ctk.CTkLabel(
+            self.ratio_frame,
+            text="Term structure: --",
+            font=ctk.CTkFont(family="Bahnschrift", size=12),
+            text_color=("#6b7280", "#9ca3af"),
+        )
+        self.term_structure_label.grid(row=5, column=0, padx=18, pady=(2, 18))
 
         indicators_section = ctk.CTkLabel(
             self.main_container,
@@ -960,6 +1188,7 @@ class ContrarianEdgeApp(ctk.CTk):
         )
         self.chart_frame.grid_columnconfigure(0, weight=1)
         self.chart_frame.grid_rowconfigure(1, weight=1)
+        self.chart_resize_job = None
 
         self.chart_header = ctk.CTkLabel(
             self.chart_frame,
@@ -968,6 +1197,16 @@ class ContrarianEdgeApp(ctk.CTk):
         )
         self.chart_header.grid(row=0, column=0, padx=18, pady=(18, 10), sticky="w")
 
+        self.chart_range_selector = ctk.CTkSegmentedButton(
+            self.chart_frame,
+            values=list(CHART_RANGES),
+            command=self.change_chart_range,
+            font=ctk.CTkFont(family="Bahnschrift", size=12, weight="bold"),
+        )
+        self.chart_range_selector.grid(
+            row=0, column=0, padx=18, pady=(18, 10), sticky="e"
+        )
+
         self.buttons_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
         self.buttons_frame.grid(
             row=13, column=0, columnspan=3, padx=20, pady=(0, 20), sticky="ew"
@@ -1008,7 +1247,7 @@ class ContrarianEdgeApp(ctk.CTk):
             font=ctk.CTkFont(family="Bahnschrift", size=11, slant="italic"),
             text_color=("#6b7280", "#9ca3af"),
         )
-        self.footer_text.grid(row=16, column=0, columnspan=3, pady=(0, 20), sticky="ew")
+        self.footer_text.grid(row=18, column=0, columnspan=3, pady=(0, 20), sticky="ew")
 
         telegram_section = ctk.CTkLabel(
             self.main_container,
@@ -1091,26 +1330,93 @@ class ContrarianEdgeApp(ctk.CTk):
 
         self.current_ratio = None
         self.previous_values = {}
-        self.ratio_history = deque(maxlen=60)
-        self.ratio_dates = deque(maxlen=60)
+        self.ratio_history = RatioHistory(
+            capacity=CHART_HISTORY_CAPACITY,
+            percentile_windows=PERCENTILE_WINDOWS,
+            zscore_window=252,
+        )
+        self.return_stats = RollingStats(252)
+        self.history_lock = threading.Lock()
+        self.history_backfilled = False
+        self.full_history_loaded = False
 
         self.chart_canvas = None
+        self.chart_image = None
+        self.chart_image_label = None
+        self.chart_generation = 0
         self.last_chart_data = None
+        self.chart_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="chart-render"
+        )
 
         self.data_cache = {}
         self.cache_timeout = 30
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+        self.refresh_schedule = Schedule(60)
+        self.signal_memo = None
+        self.provider = yf
+        self.recorder = None
+        self.fetcher = get_fetcher(yf)
+        self.cycle_deadline = 20
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="app-worker"
+        )
 
         self.start_time = time.time()
 
         self.config_manager = SecureConfigManager()
+        self.history_file = self.config_manager.config_file.parent / "ratio_history.npz"
+        self.snapshots = SnapshotStore(
+            self.load_state,
+            path=self.config_manager.config_file.parent / "last_snapshot.json",
+            name="market snapshot",
+        )
+        self.applied_state = None
+        self.ratio_history.load(self.history_file)
+        first_date = self.ratio_history.first_date()
+        self.full_history_loaded = (
+            first_date is not None and first_date <= VIX3M_FIRST_DATE
+        )
+        self.chart_range = self.config_manager.get_chart_range()
+        self.chart_range_selector.set(self.chart_range)
+        self.chart_header.configure(
+            text=f"VIX/VIX3M RATIO TREND ({CHART_RANGES[self.chart_range][1]})"
+        )
+        if self.profiler is None and self.config_manager.is_profiling_enabled():
+            self.profiler = SamplingProfiler("contrarian_edge").start()
+        if record or self.config_manager.is_recording_enabled():
+            self.recorder = FrameRecorder()
+            self.provider = RecordingProvider(yf, self.recorder)
+        if memory_watchdog or self.config_manager.is_memory_watchdog_enabled():
+            self.memory_watchdog = MemoryWatchdog("contrarian_edge").start()
+            self.build_diagnostics_panel()
+        self.background_render = self.config_manager.is_background_render_enabled()
+        self.frame_monitor = None
+        if self.profiler is not None:
+            self.frame_monitor = FrameTimeMonitor(self).start()
+        self.chart_frame.bind("<Configure>", self.on_chart_resize)
         self.notifications = NotificationSystem(self)
         self.notifications.set_custom_sound("resources/buy_signal.wav")
 
         self.load_saved_settings()
-        self.auto_refresh_enabled = True
-        self.fetch_data()
-        self.schedule_refresh()
+
+        self.stream_client = None
+        self.stream_state = {}
+        if stream_url:
+            self.auto_refresh_enabled = False
+            self.stream_client = SignalStreamClient(
+                stream_url, self.on_stream_snapshot, self.on_stream_diff
+            )
+            self.stream_client.start()
+        else:
+            self.auto_refresh_enabled = True
+            cached = self.snapshots.current()
+            if cached is not None:
+                self.apply_state(cached.data, notify=False)
+                self.applied_state = cached.data
+                self.last_updated.configure(
+                    text=f"Showing data from {cached.describe_age()} - refreshing..."
+                )
+            self.schedule_refresh()
 
     def get_vix_sentiment(self, vix_value):
         if vix_value < 12:
@@ -1152,10 +1458,8 @@ class ContrarianEdgeApp(ctk.CTk):
         else:
             return "WAIT", "#6b7280"
 
-    @lru_cache(maxsize=16)
-    def calculate_rsi(self, prices_tuple, period=14):
+    def calculate_rsi(self, prices, period=14):
         try:
-            prices = list(prices_tuple)
             if len(prices) < period + 1:
                 return None
 
@@ -1180,10 +1484,8 @@ class ContrarianEdgeApp(ctk.CTk):
             print(f"Error calculating RSI: {e}")
             return None
 
-    @lru_cache(maxsize=16)
-    def calculate_macd(self, prices_tuple):
+    def calculate_macd(self, prices):
         try:
-            prices = list(prices_tuple)
             if len(prices) < 26:
                 return None, None
 
@@ -1220,6 +1522,11 @@ class ContrarianEdgeApp(ctk.CTk):
             print(f"Error calculating MACD: {e}")
             return None, None
 
+    def calculate_ma(self, prices_list, period=200):
+        if len(prices_list) < period:
+            return None
+        return sum(prices_list[-period:]) / period
+
     def validate_indicators(
         self, spy_price, rsi_value, macd_line, signal_line, ma200_value
     ):
@@ -1246,10 +1553,23 @@ class ContrarianEdgeApp(ctk.CTk):
                     f"S&P 500 {abs(price_vs_ma):.1f}% from 200-MA (unusual)"
                 )
 
+        for warning in warnings:
+            DATA_QUALITY.warn("^GSPC", warning)
+
         return validation_passed
 
     def calculate_enhanced_signal(
-        self, ratio, vix_price, rsi, macd_crossover, above_ma200, spy_price, ma200_value
+        self,
+        ratio,
+        vix_price,
+        rsi,
+        macd_crossover,
+        above_ma200,
+        spy_price,
+        ma200_value,
+        ratio_zscore=None,
+        return_zscore=None,
+        term_inversion=None,
     ):
 
         entry_score = 0
@@ -1313,6 +1633,24 @@ class ContrarianEdgeApp(ctk.CTk):
             entry_score += 5
             signals.append("[WATCH] Below 200-MA - Caution")
 
+        if ratio_zscore is not None:
+            if ratio_zscore >= 2:
+                signals.append(
+                    f"[ENTRY] Ratio {ratio_zscore:+.1f} sigma vs 1Y - Unusual fear"
+                )
+            elif ratio_zscore <= -1:
+                signals.append(
+                    f"[WAIT] Ratio {ratio_zscore:+.1f} sigma vs 1Y - Complacent"
+                )
+
+        if term_inversion is not None and term_inversion >= 0.05:
+            signals.append(
+                f"[ENTRY] Term structure inverted {term_inversion:.0%} - Broad fear"
+            )
+
+        if return_zscore is not None and return_zscore <= -2:
+            signals.append(f"[ENTRY] S&P 500 move {return_zscore:+.1f} sigma - Selloff")
+
         entry_score = max(0, min(100, entry_score))
 
         confidence = 50
@@ -1350,6 +1688,18 @@ class ContrarianEdgeApp(ctk.CTk):
         else:
             confidence -= 10
 
+        if ratio_zscore is not None:
+            if ratio_zscore >= 2:
+                confidence += 10
+            elif ratio_zscore <= -1:
+                confidence -= 5
+
+        if return_zscore is not None and return_zscore <= -2:
+            confidence += 5
+
+        if term_inversion is not None and term_inversion >= 0.05:
+            confidence += 5
+
         if entry_signals >= 3:
             confidence += 20
         elif entry_signals >= 2:
@@ -1379,44 +1729,53 @@ class ContrarianEdgeApp(ctk.CTk):
 
         return action, entry_score, confidence, color, signals, entry_signals
 
-    def fetch_ticker_data(self, ticker_symbol, retries=3, delay=1):
-        cache_key = f"{ticker_symbol}_{int(time.time() // self.cache_timeout)}"
+    def fetch_history(self, ticker_symbol, period, deadline=None):
+        timeout = 10
+        if deadline is not None:
+            timeout = max(1, min(timeout, deadline.remaining()))
+        return self.fetcher.call(
+            f"{ticker_symbol}:{period}",
+            lambda: self.provider.Ticker(ticker_symbol).history(
+                period=period, timeout=timeout
+            ),
+            deadline,
+        )
+
+    def fetch_ticker_data(self, ticker_symbol, deadline=None):
+        cache_key = f"{ticker_symbol}_{int(get_clock().time() // self.cache_timeout)}"
         if cache_key in self.data_cache:
+            if self.recorder is not None:
+                self.recorder.record(
+                    ticker_symbol, "period=5d", self.data_cache[cache_key]
+                )
             return self.data_cache[cache_key]
 
-        for attempt in range(retries):
-            try:
-                ticker = yf.Ticker(ticker_symbol)
-                data = ticker.history(period="5d")
-                if not data.empty and len(data) > 0:
-                    self.data_cache[cache_key] = data
-                    current_time = int(time.time() // self.cache_timeout)
-                    self.data_cache = {
-                        k: v
-                        for k, v in self.data_cache.items()
-                        if int(k.split("_")[-1]) >= current_time - 2
-                    }
-                    return data
-                if attempt < retries - 1:
-                    time.sleep(delay)
-            except Exception as e:
-                if attempt < retries - 1:
-                    time.sleep(delay)
-                else:
-                    raise
-        raise ValueError(
-            f"No data available for {ticker_symbol} after {retries} attempts"
-        )
+        data = self.fetch_history(ticker_symbol, "5d", deadline)
+        self.data_cache[cache_key] = data
+        current_time = int(get_clock().time() // self.cache_timeout)
+        self.data_cache = {
+            k: v
+            for k, v in self.data_cache.items()
+            if int(k.split("_")[-1]) >= current_time - 2
+        }
+        return data
 
     def update_chart(self):
+        start = time.perf_counter()
         try:
             if len(self.ratio_history) < 2:
                 return
 
-            current_chart_data = (tuple(self.ratio_history), ctk.get_appearance_mode())
-            if (
-                self.last_chart_data == current_chart_data
-                and self.chart_canvas is not None
+            width = self.chart_frame.winfo_width() - 28
+            width = width if width > 100 else 900
+            current_chart_data = (
+                self.ratio_history.version,
+                ctk.get_appearance_mode(),
+                self.chart_range,
+                width if self.background_render else None,
+            )
+            if self.last_chart_data == current_chart_data and (
+                self.chart_canvas is not None or self.chart_image is not None
             ):
                 return
 
@@ -1424,6 +1783,22 @@ class ContrarianEdgeApp(ctk.CTk):
 
             load_matplotlib()
 
+            if self.background_render:
+                self.chart_generation += 1
+                generation = self.chart_generation
+                dates, ratios = self.chart_series()
+                future = self.chart_executor.submit(
+                    render_ratio_chart,
+                    ratios,
+                    dates,
+                    ctk.get_appearance_mode(),
+                    width,
+                )
+                future.add_done_callback(
+                    lambda f: self.after(0, self.show_chart_image, generation, f)
+                )
+                return
+
             if self.chart_canvas is not None:
                 try:
                     widget = self.chart_canvas.get_tk_widget()
@@ -1437,117 +1812,317 @@ class ContrarianEdgeApp(ctk.CTk):
 
         except Exception:
             return
+        finally:
+            if self.frame_monitor is not None:
+                self.frame_monitor.record_block(
+                    "chart update", time.perf_counter() - start
+                )
 
+        start = time.perf_counter()
         try:
-            current_mode = ctk.get_appearance_mode().lower()
-            text_color = "#ffffff" if current_mode == "dark" else "#000000"
-            grid_color = "#333333" if current_mode == "dark" else "#e0e0e0"
-            line_color = "#3b82f6"
-            bg_color = "#2b2b2b" if current_mode == "dark" else "#dbdbdb"
+            dates, ratios = self.chart_series()
+            fig, bg_color = build_ratio_figure(
+                ratios, dates, ctk.get_appearance_mode(), max_points=width
+            )
 
-            fig = Figure(figsize=(10, 3.5), facecolor=bg_color, dpi=90)
-            ax = fig.add_subplot(111)
-            ax.set_facecolor(bg_color)
+            self.chart_canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
+            self.chart_canvas.draw()
+            canvas_widget = self.chart_canvas.get_tk_widget()
+            canvas_widget.configure(background=bg_color)
+            canvas_widget.grid(row=1, column=0, padx=14, pady=(0, 14), sticky="nsew")
 
-            ratios = list(self.ratio_history)
-            dates = list(self.ratio_dates)
-            x_vals = list(range(len(ratios)))
+            plt.close(fig)
+        except Exception:
+            pass
+        finally:
+            if self.frame_monitor is not None:
+                self.frame_monitor.record_block(
+                    "chart draw", time.perf_counter() - start
+                )
 
-            if len(ratios) == 0 or len(x_vals) == 0:
-                return
+    def show_chart_image(self, generation, future):
+        if generation != self.chart_generation:
+            return
+        start = time.perf_counter()
+        try:
+            rgba, size, bg_color = future.result()
+            image = Image.frombuffer("RGBA", size, rgba, "raw", "RGBA", 0, 1)
+            self.chart_image = ImageTk.PhotoImage(image)
 
-            ax.fill_between(
-                x_vals,
-                ratios,
-                1.0,
-                where=[r >= 1.0 for r in ratios],
-                alpha=0.15,
-                color="#ef4444",
-                interpolate=True,
-            )
-            ax.fill_between(
-                x_vals,
-                ratios,
-                1.0,
-                where=[r < 1.0 for r in ratios],
-                alpha=0.15,
-                color="#22c55e",
-                interpolate=True,
+            if self.chart_image_label is None:
+                self.chart_image_label = tkinter.Label(
+                    self.chart_frame, borderwidth=0, highlightthickness=0
+                )
+                self.chart_image_label.grid(
+                    row=1, column=0, padx=14, pady=(0, 14), sticky="nsew"
+                )
+            self.chart_image_label.configure(
+                image=self.chart_image, background=bg_color
             )
+        except Exception as e:
+            print(f"Error rendering chart: {e}")
+        finally:
+            if self.frame_monitor is not None:
+                self.frame_monitor.record_block(
+                    "chart draw", time.perf_counter() - start
+                )
+
+    def on_chart_resize(self, event):
+        if self.chart_resize_job is not None:
+            self.after_cancel(self.chart_resize_job)
+        self.chart_resize_job = self.after(150, self.finish_chart_resize)
+
+    def finish_chart_resize(self):
+        self.chart_resize_job = None
+        self.update_chart()
+
+    def chart_series(self):
+        days = CHART_RANGES[self.chart_range][0]
+        with self.history_lock:
+            ordinals, ratios = self.ratio_history.arrays()
+        if days is not None:
+            ordinals, ratios = ordinals[-days:], ratios[-days:]
+        return [datetime.fromordinal(int(day)).date() for day in ordinals], ratios
+
+    def history_covers_range(self):
+        days = CHART_RANGES[self.chart_range][0]
+        if self.full_history_loaded:
+            return True
+        return days is not None and len(self.ratio_history) >= days
 
-            ax.plot(
-                x_vals,
-                ratios,
-                color=line_color,
-                linewidth=2.5,
-                marker="o",
-                markersize=5,
-                markerfacecolor=line_color,
-                markeredgecolor=bg_color,
-                markeredgewidth=1.5,
-                alpha=1.0,
-                zorder=3,
-                antialiased=True,
+    def backfill_history(self):
+        last_date = self.ratio_history.last_date()
+        try:
+            if self.history_covers_range():
+                if (get_clock().now().date() - last_date).days <= 1:
+                    self.history_backfilled = True
+                    return
+                start_date = datetime.combine(last_date, datetime.min.time())
+                vix_hist = self.provider.Ticker("^VIX").history(start=start_date)
+                vix3m_hist = self.provider.Ticker("^VIX3M").history(start=start_date)
+            else:
+                vix_hist = self.provider.Ticker("^VIX").history(period="max")
+                vix3m_hist = self.provider.Ticker("^VIX3M").history(period="max")
+
+            vix, vix3m = DATA_QUALITY.align_bars(
+                "^VIX",
+                DATA_QUALITY.check_bars("^VIX", as_bars(vix_hist)),
+                "^VIX3M",
+                DATA_QUALITY.check_bars("^VIX3M", as_bars(vix3m_hist)),
             )
+            days, ratios = ratio_bars(vix, vix3m)
+            dates = [date.fromordinal(int(day)) for day in days]
+            with self.history_lock:
+                self.ratio_history.merge(dates, ratios)
+                first_date = self.ratio_history.first_date()
+            if first_date is not None and first_date <= VIX3M_FIRST_DATE:
+                self.full_history_loaded = True
+            self.history_backfilled = True
+        except Exception as e:
+            print(f"Error loading historical data: {e}")
 
-            ax.axhline(
-                y=1.0, color="#ef4444", linestyle="--", linewidth=2, alpha=0.6, zorder=2
+    def change_chart_range(self, chart_range):
+        self.chart_range = chart_range
+        self.config_manager.update_chart_range(chart_range)
+        self.chart_header.configure(
+            text=f"VIX/VIX3M RATIO TREND ({CHART_RANGES[chart_range][1]})"
+        )
+
+        if self.history_covers_range() or self.stream_client is not None:
+            self.update_chart()
+            return
+
+        def load_range():
+            self.backfill_history()
+            self.after(0, self.update_chart)
+
+        self.executor.submit(load_range)
+
+    def load_state(self):
+        if self.recorder is not None:
+            self.recorder.next_cycle()
+
+        if not self.history_backfilled:
+            self.backfill_history()
+
+        concurrent_start = time.time()
+        deadline = Deadline(self.cycle_deadline)
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="ticker-fetch"
+        )
+        try:
+            vix_future = executor.submit(self.fetch_ticker_data, "^VIX", deadline)
+            vix3m_future = executor.submit(self.fetch_ticker_data, "^VIX3M", deadline)
+            spy_future = executor.submit(self.fetch_history, "^GSPC", "1y", deadline)
+            term_future = executor.submit(
+                latest_term_metrics, self.provider, deadline=deadline
             )
 
-            date_labels = [d.strftime("%m/%d") for d in dates]
-            if len(date_labels) > 10:
-                step = len(date_labels) // 8
-                tick_positions = list(range(0, len(date_labels), step))
-                ax.set_xticks(tick_positions)
-                ax.set_xticklabels(
-                    [date_labels[i] for i in tick_positions], rotation=45, ha="right"
+            try:
+                vix_data = vix_future.result(timeout=deadline.remaining())
+                vix3m_data = vix3m_future.result(timeout=deadline.remaining())
+            except concurrent.futures.TimeoutError:
+                raise DeadlineExceeded(
+                    f"Market data not ready within {self.cycle_deadline}s"
                 )
-            else:
-                ax.set_xticks(x_vals)
-                ax.set_xticklabels(date_labels, rotation=45, ha="right")
-
-            ax.set_xlabel(
-                "Date",
-                color=text_color,
-                fontsize=10,
-                fontfamily="Bahnschrift",
-                fontweight="600",
-                labelpad=10,
-            )
-            ax.set_ylabel(
-                "VIX/VIX3M Ratio",
-                color=text_color,
-                fontsize=10,
-                fontfamily="Bahnschrift",
-                fontweight="600",
-                labelpad=10,
-            )
-            ax.tick_params(axis="x", colors=text_color, labelsize=8, width=1, length=4)
-            ax.tick_params(axis="y", colors=text_color, labelsize=9, width=1, length=4)
-            ax.grid(
-                True, alpha=0.2, color=grid_color, linewidth=1, linestyle="-", zorder=1
-            )
+            try:
+                spy_data_full = spy_future.result(timeout=deadline.remaining())
+            except Exception:
+                spy_data_full = None
+            try:
+                term = term_future.result(timeout=deadline.remaining())
+            except Exception:
+                term = {}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            ax.spines["top"].set_visible(False)
-            ax.spines["right"].set_visible(False)
-            ax.spines["bottom"].set_color(grid_color)
-            ax.spines["left"].set_color(grid_color)
-            ax.spines["bottom"].set_linewidth(1.5)
-            ax.spines["left"].set_linewidth(1.5)
+        concurrent_time = time.time() - concurrent_start
 
-            ax.margins(x=0.02, y=0.1)
+        fingerprint = (
+            input_fingerprint(vix_data, vix3m_data, spy_data_full),
+            tuple(sorted(term.items())),
+        )
+        if self.signal_memo is not None and self.signal_memo[0] == fingerprint:
+            return self.signal_memo[1]
 
-            fig.tight_layout(pad=2.0, rect=[0, 0.03, 1, 1])
+        vix_data, vix3m_data, spy_data_full = DATA_QUALITY.clean_market_frames(
+            vix_data, vix3m_data, spy_data_full
+        )
+        if vix_data.empty or vix3m_data.empty:
+            raise ValueError("No usable VIX/VIX3M data after quality checks")
 
-            self.chart_canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-            self.chart_canvas.draw()
-            canvas_widget = self.chart_canvas.get_tk_widget()
-            canvas_widget.configure(background=bg_color)
-            canvas_widget.grid(row=1, column=0, padx=14, pady=(0, 14), sticky="nsew")
+        vix_price = float(vix_data["Close"].iloc[-1])
+        vix3m_price = float(vix3m_data["Close"].iloc[-1])
 
-            plt.close(fig)
-        except Exception:
-            pass
+        if vix_price <= 0 or vix3m_price <= 0:
+            raise ValueError("Invalid VIX/VIX3M price data")
+        if vix_price > 200 or vix3m_price > 200:
+            raise ValueError("VIX/VIX3M price seems abnormally high")
+        if vix3m_price == 0:
+            raise ValueError("VIX3M price is zero")
+
+        ratio = vix_price / vix3m_price
+        bar_date = min(vix_data.index[-1], vix3m_data.index[-1]).date()
+
+        spy_price = None
+        rsi_value = None
+        macd_line = None
+        signal_line = None
+        macd_crossover = "neutral"
+        above_ma200 = False
+        ma200_value = None
+        return_zscore = None
+
+        try:
+            if spy_data_full is not None and not spy_data_full.empty:
+                spy_price = float(spy_data_full["Close"].iloc[-1])
+                if spy_price <= 0 or spy_price > 100000:
+                    spy_price = None
+                else:
+                    prices_list = spy_data_full["Close"].tolist()
+
+                    bar_key = ("^GSPC", "1d", last_bar_key(spy_data_full))
+                    rsi_value = INDICATOR_CACHE.get_or_compute(
+                        bar_key + ("rsi", 14),
+                        self.calculate_rsi,
+                        prices_list,
+                        period=14,
+                    )
+                    macd_line, signal_line = INDICATOR_CACHE.get_or_compute(
+                        bar_key + ("macd", 12, 26, 9),
+                        self.calculate_macd,
+                        prices_list,
+                    )
+                    if macd_line is not None and signal_line is not None:
+                        if macd_line > signal_line:
+                            macd_crossover = "bullish"
+                        elif macd_line < signal_line:
+                            macd_crossover = "bearish"
+
+                    ma200_value = self.calculate_ma(prices_list, period=200)
+                    above_ma200 = ma200_value is not None and spy_price > ma200_value
+
+                    self.validate_indicators(
+                        spy_price, rsi_value, macd_line, signal_line, ma200_value
+                    )
+
+                    push_returns(
+                        self.return_stats,
+                        epoch_seconds(spy_data_full.index),
+                        spy_data_full["Close"].to_numpy(dtype=float),
+                    )
+                    return_zscore = self.return_stats.zscore()
+            else:
+                spy_price = None
+        except Exception as e:
+            spy_price = None
+
+        vix_prev = vix_data["Close"].iloc[-2] if len(vix_data) > 1 else vix_price
+        vix3m_prev = (
+            vix3m_data["Close"].iloc[-2] if len(vix3m_data) > 1 else vix3m_price
+        )
+
+        spy_prev = spy_price
+        if spy_price is not None:
+            try:
+                spy_prev = (
+                    spy_data_full["Close"].iloc[-2]
+                    if len(spy_data_full) > 1
+                    else spy_price
+                )
+            except:
+                pass
+
+        with self.history_lock:
+            ratio_zscore = self.ratio_history.stats.zscore(ratio)
+
+        (
+            signal_action,
+            entry_score,
+            confidence,
+            signal_color,
+            signals,
+            entry_signals,
+        ) = self.calculate_enhanced_signal(
+            ratio,
+            vix_price,
+            rsi_value,
+            macd_crossover,
+            above_ma200,
+            spy_price,
+            ma200_value,
+            ratio_zscore,
+            return_zscore,
+            term.get("term_inversion"),
+        )
+
+        state = {
+            "vix_price": vix_price,
+            "vix_prev": float(vix_prev),
+            "vix3m_price": vix3m_price,
+            "vix3m_prev": float(vix3m_prev),
+            "spy_price": spy_price,
+            "spy_prev": None if spy_prev is None else float(spy_prev),
+            "ratio": ratio,
+            "rsi": rsi_value,
+            "macd_line": macd_line,
+            "signal_line": signal_line,
+            "macd_crossover": macd_crossover,
+            "above_ma200": above_ma200,
+            "ma200_value": ma200_value,
+            "ratio_zscore": ratio_zscore,
+            "return_zscore": return_zscore,
+            **term,
+            "action": signal_action,
+            "entry_score": entry_score,
+            "confidence": confidence,
+            "color": signal_color,
+            "entry_signals": entry_signals,
+            "bar_date": bar_date.isoformat(),
+            "as_of": get_clock().now().isoformat(timespec="seconds"),
+        }
+        self.signal_memo = (fingerprint, state)
+        return state
 
     def fetch_data(self):
         try:
@@ -1555,293 +2130,300 @@ class ContrarianEdgeApp(ctk.CTk):
                 state="disabled", text="Fetching...", fg_color="#6b7280"
             )
 
-            if len(self.ratio_history) == 0:
-                try:
-                    end_date = datetime.now()
-                    start_date = end_date - timedelta(days=75)
-
-                    vix = yf.Ticker("^VIX")
-                    vix3m = yf.Ticker("^VIX3M")
-                    vix_hist = vix.history(start=start_date, end=end_date)
-                    vix3m_hist = vix3m.history(start=start_date, end=end_date)
-
-                    if not vix_hist.empty and not vix3m_hist.empty:
-                        vix_hist = vix_hist[["Close"]].copy()
-                        vix3m_hist = vix3m_hist[["Close"]].copy()
-                        vix_hist.index = vix_hist.index.date
-                        vix3m_hist.index = vix3m_hist.index.date
-                        common_dates = sorted(
-                            set(vix_hist.index) & set(vix3m_hist.index)
-                        )[-60:]
-
-                        for date in common_dates:
-                            vix_val = vix_hist.loc[date, "Close"]
-                            vix3m_val = vix3m_hist.loc[date, "Close"]
-                            if vix_val > 0 and vix3m_val > 0:
-                                ratio_val = vix_val / vix3m_val
-                                self.ratio_history.append(ratio_val)
-                                self.ratio_dates.append(date)
-                except Exception as e:
-                    print(f"Error loading historical data: {e}")
-
-            concurrent_start = time.time()
-            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-                vix_future = executor.submit(self.fetch_ticker_data, "^VIX")
-                vix3m_future = executor.submit(self.fetch_ticker_data, "^VIX3M")
-
-                vix_data = vix_future.result()
-                vix3m_data = vix3m_future.result()
-
-            concurrent_time = time.time() - concurrent_start
-
-            vix_price = float(vix_data["Close"].iloc[-1])
-            vix3m_price = float(vix3m_data["Close"].iloc[-1])
-
-            if vix_price <= 0 or vix3m_price <= 0:
-                raise ValueError("Invalid VIX/VIX3M price data")
-            if vix_price > 200 or vix3m_price > 200:
-                raise ValueError("VIX/VIX3M price seems abnormally high")
-            if vix3m_price == 0:
-                raise ValueError("VIX3M price is zero")
-
-            ratio = vix_price / vix3m_price
+            snapshot = self.snapshots.refresh()
+            if snapshot is None:
+                raise self.snapshots.last_error
 
-            spy_price = None
-            rsi_value = None
-            macd_line = None
-            signal_line = None
-            macd_crossover = "neutral"
-            above_ma200 = False
-            ma200_value = None
+            if snapshot.data is not self.applied_state:
+                self.apply_state(snapshot.data, notify=not self.snapshots.stale)
+                self.applied_state = snapshot.data
 
-            try:
-                spy_data_full = yf.Ticker("^GSPC").history(period="1y")
-                if not spy_data_full.empty and len(spy_data_full) > 0:
-                    spy_price = float(spy_data_full["Close"].iloc[-1])
-                    if spy_price <= 0 or spy_price > 100000:
-                        spy_price = None
-                    else:
-                        prices_list = spy_data_full["Close"].tolist()
-
-                        prices_tuple = tuple(prices_list)
-                        rsi_value = self.calculate_rsi(prices_tuple, period=14)
-                        macd_line, signal_line = self.calculate_macd(prices_tuple)
-                        if macd_line is not None and signal_line is not None:
-                            if macd_line > signal_line:
-                                macd_crossover = "bullish"
-                            elif macd_line < signal_line:
-                                macd_crossover = "bearish"
-
-                        if len(prices_list) >= 200:
-                            ma200_value = sum(prices_list[-200:]) / 200
-                            above_ma200 = spy_price > ma200_value
-
-                        self.validate_indicators(
-                            spy_price, rsi_value, macd_line, signal_line, ma200_value
-                        )
-                else:
-                    spy_price = None
-            except Exception as e:
-                spy_price = None
+            if self.snapshots.stale:
+                self.last_updated.configure(
+                    text=f"Showing data from {snapshot.describe_age()} - refresh failed"
+                )
+            else:
+                now = get_clock().now().strftime("%Y-%m-%d %H:%M:%S")
+                self.last_updated.configure(text=f"Last updated: {now}")
 
-            vix_prev = vix_data["Close"].iloc[-2] if len(vix_data) > 1 else vix_price
-            vix3m_prev = (
-                vix3m_data["Close"].iloc[-2] if len(vix3m_data) > 1 else vix3m_price
+        except Exception as e:
+            error_msg = str(e)
+            print(f"Error fetching data: {error_msg}")
+
+            if (
+                "No VIX data available" in error_msg
+                or "No VIX3M data available" in error_msg
+            ):
+                self.ratio_value.configure(text="N/A")
+                self.sentiment_badge.configure(text="CLOSED", fg_color="#6b7280")
+                self.last_updated.configure(text="Markets may be closed")
+            elif "No S&P 500 data available" in error_msg:
+                pass
+            else:
+                self.ratio_value.configure(text="ERROR")
+                self.sentiment_badge.configure(text="ERROR", fg_color="#ef4444")
+                self.last_updated.configure(text=f"Error: Unable to fetch data")
+        finally:
+            self.refresh_button.configure(
+                state="normal", text="Refresh Now", fg_color="#3b82f6"
             )
+            if self.memory_watchdog is not None:
+                lines = self.memory_watchdog.checkpoint()
+                self.after(0, self.update_diagnostics_panel, lines)
 
-            vix_change = vix_price - vix_prev
-            vix_change_pct = (vix_change / vix_prev) * 100
-            vix3m_change = vix3m_price - vix3m_prev
-            vix3m_change_pct = (vix3m_change / vix3m_prev) * 100
+    def build_diagnostics_panel(self):
+        diagnostics_section = ctk.CTkLabel(
+            self.main_container,
+            text="DIAGNOSTICS",
+            font=ctk.CTkFont(family="Bahnschrift", size=17, weight="bold"),
+        )
+        diagnostics_section.grid(
+            row=16, column=0, columnspan=3, pady=(0, 10), sticky="w", padx=20
+        )
 
-            spy_change = 0
-            spy_change_pct = 0
-            spy_prev = spy_price
-            if spy_price is not None:
-                try:
-                    spy_prev = (
-                        spy_data_full["Close"].iloc[-2]
-                        if len(spy_data_full) > 1
-                        else spy_price
-                    )
-                    spy_change = spy_price - spy_prev
-                    spy_change_pct = (spy_change / spy_prev) * 100
-                except:
-                    pass
+        self.diagnostics_frame = ctk.CTkFrame(
+            self.main_container, corner_radius=10, border_width=2
+        )
+        self.diagnostics_frame.grid(
+            row=17, column=0, columnspan=3, padx=20, pady=(0, 20), sticky="ew"
+        )
+        self.diagnostics_frame.grid_columnconfigure(0, weight=1)
+
+        self.memory_summary = ctk.CTkLabel(
+            self.diagnostics_frame,
+            text="Memory watchdog running - first checkpoint after the next refresh",
+            font=ctk.CTkFont(family="Bahnschrift", size=12, weight="bold"),
+            justify="left",
+        )
+        self.memory_summary.grid(row=0, column=0, padx=18, pady=(18, 6), sticky="w")
 
-            self.current_ratio = ratio
+        self.memory_details = ctk.CTkLabel(
+            self.diagnostics_frame,
+            text="",
+            font=ctk.CTkFont(family="Consolas", size=11),
+            text_color=("#6b7280", "#9ca3af"),
+            justify="left",
+        )
+        self.memory_details.grid(row=1, column=0, padx=18, pady=(0, 18), sticky="w")
 
-            today = datetime.now().date()
-            if len(self.ratio_dates) > 0 and self.ratio_dates[-1] == today:
-                self.ratio_history[-1] = ratio
-            else:
-                self.ratio_history.append(ratio)
-                self.ratio_dates.append(today)
+    def update_diagnostics_panel(self, lines):
+        if not lines or not hasattr(self, "memory_summary"):
+            return
+        self.memory_summary.configure(text=lines[0])
+        self.memory_details.configure(text="\n".join(lines[1:]))
+
+    def apply_state(self, state, notify=True):
+        vix_price = state["vix_price"]
+        vix3m_price = state["vix3m_price"]
+        spy_price = state["spy_price"]
+        ratio = state["ratio"]
+        rsi_value = state["rsi"]
+        macd_line = state["macd_line"]
+        signal_line = state["signal_line"]
+        macd_crossover = state["macd_crossover"]
+        above_ma200 = state["above_ma200"]
+        ma200_value = state["ma200_value"]
+        signal_action = state["action"]
+        entry_score = state["entry_score"]
+        confidence = state["confidence"]
+        signal_color = state["color"]
+        entry_signals = state["entry_signals"]
+
+        vix_prev = state["vix_prev"]
+        vix3m_prev = state["vix3m_prev"]
+        vix_change = vix_price - vix_prev
+        vix_change_pct = (vix_change / vix_prev) * 100
+        vix3m_change = vix3m_price - vix3m_prev
+        vix3m_change_pct = (vix3m_change / vix3m_prev) * 100
+
+        spy_change = 0
+        spy_change_pct = 0
+        if spy_price is not None:
+            try:
+                spy_prev = state["spy_prev"]
+                spy_change = spy_price - spy_prev
+                spy_change_pct = (spy_change / spy_prev) * 100
+            except:
+                pass
+
+        self.current_ratio = ratio
+
+        if state.get("bar_date") is not None:
+            with self.history_lock:
+                self.ratio_history.append(date.fromisoformat(state["bar_date"]), ratio)
 
-            self.vix_value.configure(text=f"{vix_price:.2f}")
-            self.vix3m_value.configure(text=f"{vix3m_price:.2f}")
-            self.ratio_value.configure(text=f"{ratio:.4f}")
+        self.vix_value.configure(text=f"{vix_price:.2f}")
+        self.vix3m_value.configure(text=f"{vix3m_price:.2f}")
+        self.ratio_value.configure(text=f"{ratio:.4f}")
 
+        with self.history_lock:
+            history_length = len(self.ratio_history)
+            percentiles = self.ratio_history.percentiles.percentiles(ratio)
+
+        if history_length >= PERCENTILE_MIN_HISTORY:
+            self.ratio_progress.set(percentiles["All"] / 100)
+            self.ratio_min_label.configure(text="0th")
+            self.ratio_max_label.configure(text="100th")
+            description = (
+                f"Percentile: 1Y {percentiles['1Y']:.0f} · "
+                f"5Y {percentiles['5Y']:.0f} · All {percentiles['All']:.0f}"
+            )
+            if state.get("ratio_zscore") is not None:
+                description += f" · z {state['ratio_zscore']:+.1f}"
+            self.ratio_description.configure(text=description)
+        else:
             ratio_min = 0.80
             ratio_max = 1.20
             ratio_clamped = max(ratio_min, min(ratio_max, ratio))
             progress_value = (ratio_clamped - ratio_min) / (ratio_max - ratio_min)
             self.ratio_progress.set(progress_value)
+            self.ratio_min_label.configure(text=f"{ratio_min:.2f}")
+            self.ratio_max_label.configure(text=f"{ratio_max:.2f}")
 
-            if ratio >= 1.05:
-                bar_color = "#22c55e"
-            elif ratio >= 0.95:
-                bar_color = "#eab308"
-            else:
-                bar_color = "#6b7280"
-
-            self.ratio_progress.configure(progress_color=bar_color)
+        if ratio >= 1.05:
+            bar_color = "#22c55e"
+        elif ratio >= 0.95:
+            bar_color = "#eab308"
+        else:
+            bar_color = "#6b7280"
 
-            if spy_price is not None:
-                self.spy_value.configure(text=f"${spy_price:.2f}")
-            else:
-                self.spy_value.configure(text="N/A")
+        self.ratio_progress.configure(progress_color=bar_color)
 
-            vix_change_color = "#ef4444" if vix_change < 0 else "#22c55e"
-            vix_arrow = "▼" if vix_change < 0 else "▲"
-            self.vix_change.configure(
-                text=f"{vix_arrow} {abs(vix_change):.2f} ({abs(vix_change_pct):.2f}%)",
-                text_color=vix_change_color,
+        if state.get("term_slope") is not None:
+            inversion = state.get("term_inversion") or 0.0
+            shape = (
+                f"inverted {inversion:.0%}"
+                if state.get("term_inverted_pairs")
+                else "contango"
             )
-
-            vix3m_change_color = "#ef4444" if vix3m_change < 0 else "#22c55e"
-            vix3m_arrow = "▼" if vix3m_change < 0 else "▲"
-            self.vix3m_change.configure(
-                text=f"{vix3m_arrow} {abs(vix3m_change):.2f} ({abs(vix3m_change_pct):.2f}%)",
-                text_color=vix3m_change_color,
+            self.term_structure_label.configure(
+                text=f"Term structure: {shape} · slope {state['term_slope']:+.2f}"
+                f" · curvature {state['term_curvature'] or 0.0:+.3f}"
             )
 
-            if spy_price is not None:
-                spy_change_color = "#22c55e" if spy_change > 0 else "#ef4444"
-                spy_arrow = "▲" if spy_change > 0 else "▼"
-                self.spy_change.configure(
-                    text=f"{spy_arrow} ${abs(spy_change):.2f} ({abs(spy_change_pct):.2f}%)",
-                    text_color=spy_change_color,
-                )
-            else:
-                self.spy_change.configure(
-                    text="Data unavailable",
-                    text_color="#6b7280",
-                )
+        if spy_price is not None:
+            self.spy_value.configure(text=f"${spy_price:.2f}")
+        else:
+            self.spy_value.configure(text="N/A")
 
-            vix_sentiment, vix_color = self.get_vix_sentiment(vix_price)
-            self.vix_sentiment_badge.configure(
-                text=vix_sentiment, fg_color=vix_color, text_color="white"
-            )
+        vix_change_color = "#ef4444" if vix_change < 0 else "#22c55e"
+        vix_arrow = "▼" if vix_change < 0 else "▲"
+        self.vix_change.configure(
+            text=f"{vix_arrow} {abs(vix_change):.2f} ({abs(vix_change_pct):.2f}%)",
+            text_color=vix_change_color,
+        )
 
-            vix3m_sentiment, vix3m_color = self.get_vix_sentiment(vix3m_price)
-            self.vix3m_sentiment_badge.configure(
-                text=vix3m_sentiment, fg_color=vix3m_color, text_color="white"
-            )
+        vix3m_change_color = "#ef4444" if vix3m_change < 0 else "#22c55e"
+        vix3m_arrow = "▼" if vix3m_change < 0 else "▲"
+        self.vix3m_change.configure(
+            text=f"{vix3m_arrow} {abs(vix3m_change):.2f} ({abs(vix3m_change_pct):.2f}%)",
+            text_color=vix3m_change_color,
+        )
 
-            ratio_sentiment, ratio_color = self.get_ratio_sentiment(ratio)
-            self.sentiment_badge.configure(
-                text=ratio_sentiment, fg_color=bar_color, text_color="white"
+        if spy_price is not None:
+            spy_change_color = "#22c55e" if spy_change > 0 else "#ef4444"
+            spy_arrow = "▲" if spy_change > 0 else "▼"
+            self.spy_change.configure(
+                text=f"{spy_arrow} ${abs(spy_change):.2f} ({abs(spy_change_pct):.2f}%)",
+                text_color=spy_change_color,
+            )
+        else:
+            self.spy_change.configure(
+                text="Data unavailable",
+                text_color="#6b7280",
             )
 
-            if rsi_value is not None:
-                self.rsi_value.configure(text=f"{rsi_value:.1f}")
-                if rsi_value < 30:
-                    rsi_status_text = "Oversold - Strong Entry Signal"
-                    rsi_status_color = "#22c55e"
-                elif rsi_value < 40:
-                    rsi_status_text = "Approaching Oversold - Entry Zone"
-                    rsi_status_color = "#22c55e"
-                elif rsi_value < 50:
-                    rsi_status_text = "Neutral-Low - Monitor"
-                    rsi_status_color = "#3b82f6"
-                elif rsi_value < 70:
-                    rsi_status_text = "Neutral-High - No Entry"
-                    rsi_status_color = "#6b7280"
-                else:
-                    rsi_status_text = "Overbought - Wait"
-                    rsi_status_color = "#6b7280"
-                self.rsi_status.configure(
-                    text=rsi_status_text, text_color=rsi_status_color
-                )
+        vix_sentiment, vix_color = self.get_vix_sentiment(vix_price)
+        self.vix_sentiment_badge.configure(
+            text=vix_sentiment, fg_color=vix_color, text_color="white"
+        )
+
+        vix3m_sentiment, vix3m_color = self.get_vix_sentiment(vix3m_price)
+        self.vix3m_sentiment_badge.configure(
+            text=vix3m_sentiment, fg_color=vix3m_color, text_color="white"
+        )
+
+        ratio_sentiment, ratio_color = self.get_ratio_sentiment(ratio)
+        self.sentiment_badge.configure(
+            text=ratio_sentiment, fg_color=bar_color, text_color="white"
+        )
+
+        if rsi_value is not None:
+            self.rsi_value.configure(text=f"{rsi_value:.1f}")
+            if rsi_value < 30:
+                rsi_status_text = "Oversold - Strong Entry Signal"
+                rsi_status_color = "#22c55e"
+            elif rsi_value < 40:
+                rsi_status_text = "Approaching Oversold - Entry Zone"
+                rsi_status_color = "#22c55e"
+            elif rsi_value < 50:
+                rsi_status_text = "Neutral-Low - Monitor"
+                rsi_status_color = "#3b82f6"
+            elif rsi_value < 70:
+                rsi_status_text = "Neutral-High - No Entry"
+                rsi_status_color = "#6b7280"
             else:
-                self.rsi_value.configure(text="--")
-                self.rsi_status.configure(text="Data unavailable", text_color="#6b7280")
-
-            if macd_line is not None and signal_line is not None:
-                if macd_crossover == "bullish":
-                    self.macd_value.configure(text="BULLISH")
-                    self.macd_dot.configure(text_color="#22c55e")
-                    self.macd_status.configure(
-                        text="Bullish Momentum Confirmed", text_color="#22c55e"
-                    )
-                elif macd_crossover == "bearish":
-                    self.macd_value.configure(text="BEARISH")
-                    self.macd_dot.configure(text_color="#f97316")
-                    self.macd_status.configure(
-                        text="Wait for Momentum Shift", text_color="#f97316"
-                    )
-                else:
-                    self.macd_value.configure(text="NEUTRAL")
-                    self.macd_dot.configure(text_color="#eab308")
-                    self.macd_status.configure(
-                        text="Neutral - Monitor", text_color="#eab308"
-                    )
+                rsi_status_text = "Overbought - Wait"
+                rsi_status_color = "#6b7280"
+            self.rsi_status.configure(text=rsi_status_text, text_color=rsi_status_color)
+        else:
+            self.rsi_value.configure(text="--")
+            self.rsi_status.configure(text="Data unavailable", text_color="#6b7280")
+
+        if macd_line is not None and signal_line is not None:
+            if macd_crossover == "bullish":
+                self.macd_value.configure(text="BULLISH")
+                self.macd_dot.configure(text_color="#22c55e")
+                self.macd_status.configure(
+                    text="Bullish Momentum Confirmed", text_color="#22c55e"
+                )
+            elif macd_crossover == "bearish":
+                self.macd_value.configure(text="BEARISH")
+                self.macd_dot.configure(text_color="#f97316")
+                self.macd_status.configure(
+                    text="Wait for Momentum Shift", text_color="#f97316"
+                )
             else:
-                self.macd_value.configure(text="--")
-                self.macd_dot.configure(text_color="#6b7280")
+                self.macd_value.configure(text="NEUTRAL")
+                self.macd_dot.configure(text_color="#eab308")
                 self.macd_status.configure(
-                    text="Data unavailable", text_color="#6b7280"
+                    text="Neutral - Monitor", text_color="#eab308"
+                )
+        else:
+            self.macd_value.configure(text="--")
+            self.macd_dot.configure(text_color="#6b7280")
+            self.macd_status.configure(text="Data unavailable", text_color="#6b7280")
+
+        if ma200_value is not None:
+            if above_ma200:
+                self.ma200_value.configure(text="ABOVE")
+                self.ma200_dot.configure(text_color="#22c55e")
+                self.ma200_status.configure(
+                    text="Bull Trend - Favorable Entry", text_color="#22c55e"
                 )
-
-            if ma200_value is not None:
-                if above_ma200:
-                    self.ma200_value.configure(text="ABOVE")
-                    self.ma200_dot.configure(text_color="#22c55e")
-                    self.ma200_status.configure(
-                        text="Bull Trend - Favorable Entry", text_color="#22c55e"
-                    )
-                else:
-                    self.ma200_value.configure(text="BELOW")
-                    self.ma200_dot.configure(text_color="#eab308")
-                    self.ma200_status.configure(
-                        text="Below 200-MA - Use Caution", text_color="#eab308"
-                    )
             else:
-                self.ma200_value.configure(text="--")
-                self.ma200_dot.configure(text_color="#6b7280")
+                self.ma200_value.configure(text="BELOW")
+                self.ma200_dot.configure(text_color="#eab308")
                 self.ma200_status.configure(
-                    text="Data unavailable", text_color="#6b7280"
+                    text="Below 200-MA - Use Caution", text_color="#eab308"
                 )
+        else:
+            self.ma200_value.configure(text="--")
+            self.ma200_dot.configure(text_color="#6b7280")
+            self.ma200_status.configure(text="Data unavailable", text_color="#6b7280")
+
+        signal_icons = {
+            "STRONG BUY": "STRONG BUY",
+            "BUY": "BUY",
+            "MODERATE BUY": "MODERATE BUY",
+            "WATCH": "WATCH",
+            "WAIT": "WAIT",
+        }
+        display_action = signal_icons.get(signal_action, signal_action)
+        self.signal_action.configure(text=display_action)
+        self.signal_dot.configure(text_color=signal_color)
 
-            (
-                signal_action,
-                entry_score,
-                confidence,
-                signal_color,
-                signals,
-                entry_signals,
-            ) = self.calculate_enhanced_signal(
-                ratio,
-                vix_price,
-                rsi_value,
-                macd_crossover,
-                above_ma200,
-                spy_price,
-                ma200_value,
-            )
-
-            signal_icons = {
-                "STRONG BUY": "STRONG BUY",
-                "BUY": "BUY",
-                "MODERATE BUY": "MODERATE BUY",
-                "WATCH": "WATCH",
-                "WAIT": "WAIT",
-            }
-            display_action = signal_icons.get(signal_action, signal_action)
-            self.signal_action.configure(text=display_action)
-            self.signal_dot.configure(text_color=signal_color)
-
+        if notify:
             self.notifications.check_signal_change(
                 signal_action,
                 confidence,
@@ -1851,91 +2433,107 @@ class ContrarianEdgeApp(ctk.CTk):
                 vix3m_price,
                 spy_price,
             )
+        else:
+            self.notifications.last_signal = signal_action
 
-            self.signal_confidence.configure(
-                text=f"Entry Score: {entry_score}/100", text_color=signal_color
-            )
-            self.signal_details.configure(
-                text=f"Confidence: {confidence}% | {entry_signals}/4 signals active"
-            )
+        self.signal_confidence.configure(
+            text=f"Entry Score: {entry_score}/100", text_color=signal_color
+        )
+        self.signal_details.configure(
+            text=f"Confidence: {confidence}% | {entry_signals}/4 signals active"
+        )
 
-            try:
-                self.signal_bar.set(entry_score / 100.0)
-                self.signal_bar.configure(progress_color=signal_color)
-            except Exception:
-                pass
+        try:
+            self.signal_bar.set(entry_score / 100.0)
+            self.signal_bar.configure(progress_color=signal_color)
+        except Exception:
+            pass
 
-            if signal_action == "STRONG BUY":
-                if confidence >= 80:
-                    signal_descriptions = "EXTREME FEAR + MAXIMUM CONFIDENCE - All signals aligned perfectly. Maximum allocation recommended for S&P 500 ETFs."
-                else:
-                    signal_descriptions = "EXTREME FEAR + STRONG CONFIRMATION - Prime contrarian opportunity with 4/4 signals active. High confidence entry."
-            elif signal_action == "BUY":
-                if confidence >= 75:
-                    signal_descriptions = "STRONG SETUP + HIGH CONFIDENCE - Excellent signal alignment. Consider 60-80% allocation to S&P 500 ETFs."
-                elif confidence >= 60:
-                    signal_descriptions = "ELEVATED FEAR + GOOD CONFIRMATION - Strong entry opportunity with solid technical backing."
-                else:
-                    signal_descriptions = "HIGH SCORE + MODERATE CONFIDENCE - Strong setup but some conflicting signals. Consider smaller position size."
-            elif signal_action == "MODERATE BUY":
-                if confidence >= 80:
-                    signal_descriptions = "MODERATE SCORE + HIGH CONFIDENCE - Lower entry score but excellent signal alignment. Conservative entry with room to add on weakness."
-                elif confidence >= 60:
-                    signal_descriptions = "DEVELOPING SETUP + GOOD ALIGNMENT - Contrarian conditions improving. Consider partial S&P 500 ETF position."
-                else:
-                    signal_descriptions = "MODERATE SETUP + MIXED SIGNALS - Some contrarian elements present but signals are conflicting. Monitor closely."
-            elif signal_action == "WATCH":
-                if confidence >= 70:
-                    signal_descriptions = "LOW SCORE + HIGH CONFIDENCE - Strong signal alignment but insufficient contrarian setup. Wait for fear levels to increase."
-                elif confidence >= 50:
-                    signal_descriptions = "MODERATE CONDITIONS + MODERATE ALIGNMENT - Mixed signals with moderate confidence. Monitor for stronger entry signals to develop."
-                else:
-                    signal_descriptions = "MODERATE CONDITIONS + LOW ALIGNMENT - Conflicting signals with low confidence. Wait for clearer market direction."
+        if signal_action == "STRONG BUY":
+            if confidence >= 80:
+                signal_descriptions = "EXTREME FEAR + MAXIMUM CONFIDENCE - All signals aligned perfectly. Maximum allocation recommended for S&P 500 ETFs."
             else:
-                if confidence >= 60:
-                    signal_descriptions = "LOW SCORE + HIGH CONFIDENCE - Strong signal alignment but no contrarian opportunity. Wait for fear spike."
-                elif confidence >= 40:
-                    signal_descriptions = "INSUFFICIENT SETUP + MODERATE ALIGNMENT - Some signals present but insufficient for entry. Wait for better contrarian setup."
-                else:
-                    signal_descriptions = "INSUFFICIENT SIGNALS + LOW ALIGNMENT - No clear contrarian opportunity. Wait for fear/technical confirmation to improve."
-            self.signal_description.configure(text=signal_descriptions)
+                signal_descriptions = "EXTREME FEAR + STRONG CONFIRMATION - Prime contrarian opportunity with 4/4 signals active. High confidence entry."
+        elif signal_action == "BUY":
+            if confidence >= 75:
+                signal_descriptions = "STRONG SETUP + HIGH CONFIDENCE - Excellent signal alignment. Consider 60-80% allocation to S&P 500 ETFs."
+            elif confidence >= 60:
+                signal_descriptions = "ELEVATED FEAR + GOOD CONFIRMATION - Strong entry opportunity with solid technical backing."
+            else:
+                signal_descriptions = "HIGH SCORE + MODERATE CONFIDENCE - Strong setup but some conflicting signals. Consider smaller position size."
+        elif signal_action == "MODERATE BUY":
+            if confidence >= 80:
+                signal_descriptions = "MODERATE SCORE + HIGH CONFIDENCE - Lower entry score but excellent signal alignment. Conservative entry with room to add on weakness."
+            elif confidence >= 60:
+                signal_descriptions = "DEVELOPING SETUP + GOOD ALIGNMENT - Contrarian conditions improving. Consider partial S&P 500 ETF position."
+            else:
+                signal_descriptions = "MODERATE SETUP + MIXED SIGNALS - Some contrarian elements present but signals are conflicting. Monitor closely."
+        elif signal_action == "WATCH":
+            if confidence >= 70:
+                signal_descriptions = "LOW SCORE + HIGH CONFIDENCE - Strong signal alignment but insufficient contrarian setup. Wait for fear levels to increase."
+            elif confidence >= 50:
+                signal_descriptions = "MODERATE CONDITIONS + MODERATE ALIGNMENT - Mixed signals with moderate confidence. Monitor for stronger entry signals to develop."
+            else:
+                signal_descriptions = "MODERATE CONDITIONS + LOW ALIGNMENT - Conflicting signals with low confidence. Wait for clearer market direction."
+        else:
+            if confidence >= 60:
+                signal_descriptions = "LOW SCORE + HIGH CONFIDENCE - Strong signal alignment but no contrarian opportunity. Wait for fear spike."
+            elif confidence >= 40:
+                signal_descriptions = "INSUFFICIENT SETUP + MODERATE ALIGNMENT - Some signals present but insufficient for entry. Wait for better contrarian setup."
+            else:
+                signal_descriptions = "INSUFFICIENT SIGNALS + LOW ALIGNMENT - No clear contrarian opportunity. Wait for fear/technical confirmation to improve."
+        self.signal_description.configure(text=signal_descriptions)
 
-            self.update_chart()
+        self.update_chart()
+
+        now = get_clock().now().strftime("%Y-%m-%d %H:%M:%S")
+        self.last_updated.configure(text=f"Last updated: {now}")
+
+    def on_stream_snapshot(self, state, history):
+        self.after(0, self.apply_stream_snapshot, state, history)
 
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.last_updated.configure(text=f"Last updated: {now}")
+    def on_stream_diff(self, diff):
+        self.after(0, self.apply_stream_diff, diff)
 
+    def apply_stream_snapshot(self, state, history):
+        try:
+            with self.history_lock:
+                self.ratio_history.merge(
+                    [datetime.fromisoformat(d).date() for d in history["dates"]],
+                    history["ratios"],
+                )
+            self.stream_state = dict(state)
+            self.apply_state(self.stream_state)
         except Exception as e:
-            error_msg = str(e)
-            print(f"Error fetching data: {error_msg}")
+            print(f"Error applying stream snapshot: {e}")
 
-            if (
-                "No VIX data available" in error_msg
-                or "No VIX3M data available" in error_msg
-            ):
-                self.ratio_value.configure(text="N/A")
-                self.sentiment_badge.configure(text="CLOSED", fg_color="#6b7280")
-                self.last_updated.configure(text="Markets may be closed")
-            elif "No S&P 500 data available" in error_msg:
-                pass
-            else:
-                self.ratio_value.configure(text="ERROR")
-                self.sentiment_badge.configure(text="ERROR", fg_color="#ef4444")
-                self.last_updated.configure(text=f"Error: Unable to fetch data")
-        finally:
-            self.refresh_button.configure(
-                state="normal", text="Refresh Now", fg_color="#3b82f6"
-            )
+    def apply_stream_diff(self, diff):
+        if not self.stream_state:
+            return
+        try:
+            diff = dict(diff)
+            diff.pop("history_tail", None)
+            self.stream_state.update(diff)
+            self.apply_state(self.stream_state)
+        except Exception as e:
+            print(f"Error applying stream update: {e}")
 
     def manual_refresh(self):
-        thread = threading.Thread(target=self.fetch_data, daemon=True)
+        thread = threading.Thread(
+            target=self.fetch_data, name="manual-refresh", daemon=True
+        )
         thread.start()
 
     def schedule_refresh(self):
         if self.auto_refresh_enabled:
-            thread = threading.Thread(target=self.fetch_data, daemon=True)
+            thread = threading.Thread(
+                target=self.fetch_data, name="scheduled-refresh", daemon=True
+            )
             thread.start()
-            self.after(60000, self.schedule_refresh)
+            self.refresh_schedule.mark_run()
+            self.after(
+                int(self.refresh_schedule.due_in() * 1000), self.schedule_refresh
+            )
 
     def toggle_theme(self):
         current_mode = ctk.get_appearance_mode().lower()
@@ -2044,6 +2642,8 @@ class ContrarianEdgeApp(ctk.CTk):
     def cleanup(self):
         if hasattr(self, "executor"):
             self.executor.shutdown(wait=False)
+        if hasattr(self, "chart_executor"):
+            self.chart_executor.shutdown(wait=False)
         if hasattr(self, "chart_canvas") and self.chart_canvas is not None:
             try:
                 widget = self.chart_canvas.get_tk_widget()
@@ -2053,6 +2653,23 @@ class ContrarianEdgeApp(ctk.CTk):
                 pass
         if hasattr(self, "notifications"):
             self.notifications.close_toast()
+        if hasattr(self, "history_file"):
+            self.ratio_history.save(self.history_file)
+        if getattr(self, "stream_client", None) is not None:
+            self.stream_client.stop()
+        if getattr(self, "frame_monitor", None) is not None:
+            self.frame_monitor.stop()
+            for line in self.frame_monitor.summary():
+                print(line)
+            print(f"Indicator cache: {INDICATOR_CACHE.stats()}")
+            print(f"Data quality: {DATA_QUALITY.stats()}")
+            self.frame_monitor = None
+        if getattr(self, "profiler", None) is not None:
+            self.profiler.stop_and_dump()
+            self.profiler = None
+        if getattr(self, "memory_watchdog", None) is not None:
+            self.memory_watchdog.stop_and_dump()
+            self.memory_watchdog = None
         self.data_cache.clear()
         gc.collect()
 
@@ -2061,7 +2678,15 @@ class ContrarianEdgeApp(ctk.CTk):
 
 
 if __name__ == "__main__":
-    app = ContrarianEdgeApp()
+    stream_url = None
+    if "--stream" in sys.argv[:-1]:
+        stream_url = sys.argv[sys.argv.index("--stream") + 1]
+    app = ContrarianEdgeApp(
+        profile="--profile" in sys.argv,
+        stream_url=stream_url,
+        record="--record" in sys.argv,
+        memory_watchdog="--memory-watchdog" in sys.argv,
+    )
     try:
         app.mainloop()
     finally:
@@ -0,0 +1,256 @@
+import threading
+from collections import Counter, deque
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from bars import EPOCH_ORDINAL, day_ordinals
+from clock import get_clock
+
+JUMP_LIMITS = {
+    "^VIX9D": 1.5,
+    "^VIX": 1.2,
+    "^VIX3M": 0.8,
+    "^VIX6M": 0.6,
+    "^VIX1Y": 0.5,
+    "^GSPC": 0.25,
+}
+PRICE_LIMITS = {
+    "^VIX9D": 200.0,
+    "^VIX": 200.0,
+    "^VIX3M": 200.0,
+    "^VIX6M": 200.0,
+    "^VIX1Y": 200.0,
+    "^GSPC": 100000.0,
+}
+
+
+def bar_issues(closes, days, jump_limit=0.25, max_price=None, stale_run=3):
+    closes = np.asarray(closes, dtype=np.float64)
+    count = len(closes)
+    issues = {}
+
+    usable = np.isfinite(closes) & (closes > 0)
+    issues["missing or non-positive close"] = ~usable
+    if max_price is not None:
+        issues["close above plausible range"] = usable & (closes > max_price)
+
+    weekdays = (np.asarray(days, dtype=np.int64) - 1) % 7
+    issues["bar outside trading sessions"] = weekdays >= 5
+
+    if stale_run is not None and count >= stale_run:
+        same = (closes[1:] == closes[:-1]).astype(np.int64)
+        run = np.convolve(same, np.ones(stale_run - 1, dtype=np.int64), "valid")
+        stale = np.zeros(count, dtype=bool)
+        stale[stale_run - 1 :] = run == stale_run - 1
+        issues["stale repeated close"] = stale & usable
+
+    if count >= 2:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            moves = np.diff(np.log(np.where(usable, closes, np.nan)))
+        big = np.abs(moves) > jump_limit
+        into = np.zeros(count, dtype=bool)
+        into[1:] = big
+        out = np.ones(count, dtype=bool)
+        out[:-1] = big
+        reverted = np.ones(count, dtype=bool)
+        reverted[1:-1] = np.sign(moves[:-1]) != np.sign(moves[1:])
+        issues["absurd jump"] = into & out & reverted
+
+    return issues
+
+
+def day_label(ordinal):
+    return date.fromordinal(int(ordinal)).isoformat()
+
+
+def timestamp_label(seconds):
+    return datetime.fromtimestamp(int(seconds), timezone.utc).isoformat(
+        timespec="minutes"
+    )
+
+
+def session_gaps(days, max_missing=3):
+    if len(days) < 2:
+        return []
+    dates = (np.asarray(days, dtype=np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+    missing = np.busday_count(dates[:-1], dates[1:]) - 1
+    return [
+        (str(dates[i]), str(dates[i + 1]), int(missing[i]))
+        for i in np.flatnonzero(missing > max_missing)
+    ]
+
+
+class DataQuality:
+    def __init__(self, stale_run=3, max_gap=3, history=500):
+        self.stale_run = stale_run
+        self.max_gap = max_gap
+        self.quarantine = deque(maxlen=history)
+        self.warnings = deque(maxlen=history)
+        self.reasons = Counter()
+        self.checked = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def _report(self, key, message):
+        with self._lock:
+            if key in self._seen:
+                return False
+            if len(self._seen) > 20 * self.quarantine.maxlen:
+                self._seen.clear()
+            self._seen.add(key)
+        print(message)
+        return True
+
+    def warn(self, symbol, message):
+        if self._report(("warning", symbol, message), f"{symbol}: {message}"):
+            self.warnings.append(
+                {
+                    "symbol": symbol,
+                    "message": message,
+                    "detected_at": get_clock().time(),
+                }
+            )
+
+    def reject(self, symbol, days, closes, mask, reason, label=day_label):
+        for key, close in zip(days[mask], closes[mask]):
+            day = label(key)
+            message = f"Quarantined {symbol} bar {day} ({close}): {reason}"
+            if self._report((symbol, day, reason), message):
+                self.reasons[reason] += 1
+                self.quarantine.append(
+                    {
+                        "symbol": symbol,
+                        "date": day,
+                        "close": float(close),
+                        "reason": reason,
+                        "detected_at": get_clock().time(),
+                    }
+                )
+
+    def bad_bars(self, symbol, days, closes):
+        issues = bar_issues(
+            closes,
+            days,
+            JUMP_LIMITS.get(symbol, 0.25),
+            PRICE_LIMITS.get(symbol),
+            self.stale_run,
+        )
+        self.checked += len(closes)
+
+        bad = np.zeros(len(closes), dtype=bool)
+        for reason, mask in issues.items():
+            mask = mask & ~bad
+            if mask.any():
+                self.reject(symbol, days, closes, mask, reason)
+                bad |= mask
+
+        for start, end, sessions in session_gaps(days[~bad], self.max_gap):
+            self.warn(symbol, f"{sessions} sessions missing between {start} and {end}")
+        return bad
+
+    def bad_intraday_bars(self, symbol, timestamps, closes):
+        issues = bar_issues(
+            closes,
+            timestamps // 86400 + EPOCH_ORDINAL,
+            JUMP_LIMITS.get(symbol, 0.25),
+            PRICE_LIMITS.get(symbol),
+            None,
+        )
+        self.checked += len(closes)
+
+        bad = np.zeros(len(closes), dtype=bool)
+        for reason, mask in issues.items():
+            mask = mask & ~bad
+            if mask.any():
+                self.reject(symbol, timestamps, closes, mask, reason, timestamp_label)
+                bad |= mask
+        return bad
+
+    def unmatched_bars(self, near_symbol, near, far_symbol, far):
+        near_days, near_closes = near
+        far_days, far_closes = far
+        near_only = ~np.isin(near_days, far_days) & (near_days >= far_days[0])
+        far_only = ~np.isin(far_days, near_days) & (far_days >= near_days[0])
+        if near_only.any():
+            self.reject(
+                near_symbol,
+                near_days,
+                near_closes,
+                near_only,
+                f"no matching {far_symbol} bar",
+            )
+        if far_only.any():
+            self.reject(
+                far_symbol,
+                far_days,
+                far_closes,
+                far_only,
+                f"no matching {near_symbol} bar",
+            )
+        return near_only, far_only
+
+    def check(self, symbol, frame):
+        if frame is None or frame.empty:
+            return frame
+        bad = self.bad_bars(
+            symbol, day_ordinals(frame.index), frame["Close"].to_numpy(dtype=np.float64)
+        )
+        return frame[~bad] if bad.any() else frame
+
+    def check_bars(self, symbol, bars):
+        if bars is None or bars.empty:
+            return bars
+        bad = self.bad_bars(symbol, bars.days, bars.closes)
+        return bars[~bad] if bad.any() else bars
+
+    def align(self, near_symbol, near, far_symbol, far):
+        if near is None or far is None or near.empty or far.empty:
+            return near, far
+        near_only, far_only = self.unmatched_bars(
+            near_symbol,
+            (day_ordinals(near.index), near["Close"].to_numpy()),
+            far_symbol,
+            (day_ordinals(far.index), far["Close"].to_numpy()),
+        )
+        if near_only.any():
+            near = near[~near_only]
+        if far_only.any():
+            far = far[~far_only]
+        return near, far
+
+    def align_bars(self, near_symbol, near, far_symbol, far):
+        if near is None or far is None or near.empty or far.empty:
+            return near, far
+        near_only, far_only = self.unmatched_bars(
+            near_symbol, (near.days, near.closes), far_symbol, (far.days, far.closes)
+        )
+        if near_only.any():
+            near = near[~near_only]
+        if far_only.any():
+            far = far[~far_only]
+        return near, far
+
+    def clean_market_frames(self, vix_data, vix3m_data, spy_data):
+        vix_data = self.check("^VIX", vix_data)
+        vix3m_data = self.check("^VIX3M", vix3m_data)
+        vix_data, vix3m_data = self.align("^VIX", vix_data, "^VIX3M", vix3m_data)
+        return vix_data, vix3m_data, self.check("^GSPC", spy_data)
+
+    def clean_market_bars(self, vix, vix3m, spy):
+        vix = self.check_bars("^VIX", vix)
+        vix3m = self.check_bars("^VIX3M", vix3m)
+        vix, vix3m = self.align_bars("^VIX", vix, "^VIX3M", vix3m)
+        return vix, vix3m, self.check_bars("^GSPC", spy)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "quarantined": sum(self.reasons.values()),
+                "warnings": len(self.warnings),
+                "by_reason": dict(self.reasons),
+            }
+
+
+DATA_QUALITY = DataQuality()
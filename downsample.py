@@ -0,0 +1,59 @@
+import numpy as np
+
+
+def minmax_indices(y, buckets):
+    n = len(y)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    indices = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        chunk = y[start:end]
+        low = start + int(np.argmin(chunk))
+        high = start + int(np.argmax(chunk))
+        indices.extend(sorted({low, high}))
+    return np.asarray(indices, dtype=np.int64)
+
+
+def lttb_indices(x, y, threshold):
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        px, py = x[previous], y[previous]
+        areas = np.abs(
+            (px - avg_x) * (y[start:end] - py) - (px - x[start:end]) * (avg_y - py)
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def downsample_indices(y, threshold, preselect=4):
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= threshold:
+        return np.arange(n)
+
+    candidates = np.arange(n)
+    if n > threshold * preselect:
+        candidates = minmax_indices(y, threshold * preselect // 2)
+        candidates = np.unique(np.concatenate(([0], candidates, [n - 1])))
+
+    picked = lttb_indices(candidates.astype(np.float64), y[candidates], threshold)
+    extremes = [int(np.argmin(y)), int(np.argmax(y))]
+    return np.union1d(candidates[picked], extremes)
@@ -0,0 +1,178 @@
+import argparse
+import re
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BarStore, dedupe_bars
+from bars import day_ordinals
+from ring_buffer import CHART_HISTORY_CAPACITY, RatioHistory
+
+DATE_COLUMNS = ("date", "datetime", "timestamp")
+CLOSE_COLUMNS = ("close", "adj close")
+DATE_FORMATS = (
+    (re.compile(r"\d{4}-\d{2}-\d{2}$"), "%Y-%m-%d"),
+    (re.compile(r"\d{1,2}/\d{1,2}/\d{4}$"), "%m/%d/%Y"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[ T]"), None),
+)
+
+
+def detect_columns(path):
+    columns = {c.strip().lower(): c for c in pd.read_csv(path, nrows=0).columns}
+    date_column = next((columns[c] for c in DATE_COLUMNS if c in columns), None)
+    close_column = next((columns[c] for c in CLOSE_COLUMNS if c in columns), None)
+    if date_column is None or close_column is None:
+        raise ValueError(f"{path}: expected a date and a close column")
+    return date_column, close_column
+
+
+def detect_date_format(sample):
+    for pattern, date_format in DATE_FORMATS:
+        if pattern.match(sample.strip()):
+            return date_format
+    raise ValueError(f"Unrecognised date format: {sample!r}")
+
+
+def parse_chunk(chunk, date_column, close_column, date_format):
+    values = chunk[date_column]
+    if date_format is None:
+        values = values.str.slice(0, 10)
+        date_format = "%Y-%m-%d"
+    parsed = pd.DatetimeIndex(
+        pd.to_datetime(values, format=date_format, errors="coerce", cache=True)
+    )
+    closes = chunk[close_column].to_numpy(dtype=np.float64)
+    valid = ~parsed.isna() & np.isfinite(closes) & (closes > 0)
+    return day_ordinals(parsed[valid]), closes[valid], int((~valid).sum())
+
+
+def read_bars(path, chunksize=1_000_000):
+    date_column, close_column = detect_columns(path)
+    date_format = None
+    reader = pd.read_csv(
+        path,
+        usecols=[date_column, close_column],
+        dtype={date_column: str},
+        chunksize=chunksize,
+        na_values=["", "null", "NaN", "."],
+        on_bad_lines="skip",
+    )
+    with reader:
+        for index, chunk in enumerate(reader):
+            chunk[close_column] = pd.to_numeric(chunk[close_column], errors="coerce")
+            if index == 0:
+                date_format = detect_date_format(chunk[date_column].iloc[0])
+            yield parse_chunk(chunk, date_column, close_column, date_format)
+
+
+def import_csv(path, chunksize=1_000_000):
+    start = time.perf_counter()
+    all_days = []
+    all_closes = []
+    rows = 0
+    rejected = 0
+    for days, closes, bad in read_bars(path, chunksize):
+        rows += len(days) + bad
+        rejected += bad
+        days, closes = dedupe_bars(days, closes)
+        all_days.append(days)
+        all_closes.append(closes)
+
+    if not all_days:
+        days = np.empty(0, dtype=np.int64)
+        closes = np.empty(0, dtype=np.float64)
+    else:
+        days, closes = dedupe_bars(np.concatenate(all_days), np.concatenate(all_closes))
+
+    elapsed = time.perf_counter() - start
+    return (
+        days,
+        closes,
+        {
+            "rows": rows,
+            "rejected": rejected,
+            "duplicates": rows - rejected - len(days),
+            "bars": len(days),
+            "seconds": elapsed,
+            "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+        },
+    )
+
+
+def update_ratio_history(store, history_file, capacity=CHART_HISTORY_CAPACITY):
+    vix_days, vix = store.load("^VIX")
+    vix3m_days, vix3m = store.load("^VIX3M")
+    common, vix_idx, vix3m_idx = np.intersect1d(
+        vix_days, vix3m_days, assume_unique=True, return_indices=True
+    )
+    if len(common) == 0:
+        return 0
+
+    ratios = vix[vix_idx] / vix3m[vix3m_idx]
+    history = RatioHistory(capacity=capacity)
+    history.load(history_file)
+    history.merge(
+        [date.fromordinal(int(day)) for day in common[-capacity:]],
+        ratios[-capacity:],
+    )
+    history.save(history_file)
+    return len(history)
+
+
+def import_archives(files, config_dir, chunksize=1_000_000):
+    config_dir = Path(config_dir)
+    store = BarStore(config_dir / "bars")
+    results = {}
+    for symbol, path in files.items():
+        days, closes, stats = import_csv(path, chunksize)
+        stats["stored"] = store.merge(symbol, days, closes)
+        results[symbol] = stats
+        print(
+            f"{symbol}: {stats['bars']:,} bars from {stats['rows']:,} rows "
+            f"({stats['rejected']:,} rejected, {stats['duplicates']:,} duplicates) "
+            f"in {stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} rows/s)"
+        )
+
+    if "^VIX" in files or "^VIX3M" in files:
+        length = update_ratio_history(store, config_dir / "ratio_history.npz")
+        print(f"Ratio history now holds {length:,} days")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Import CBOE/Yahoo CSV archives into the local bar store"
+    )
+    parser.add_argument("--vix", help="^VIX CSV file (optionally .gz)")
+    parser.add_argument("--vix3m", help="^VIX3M CSV file (optionally .gz)")
+    parser.add_argument("--gspc", help="^GSPC CSV file (optionally .gz)")
+    parser.add_argument("--config-dir", default="dist/config")
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    files = {
+        symbol: path
+        for symbol, path in (
+            ("^VIX", args.vix),
+            ("^VIX3M", args.vix3m),
+            ("^GSPC", args.gspc),
+        )
+        if path
+    }
+    if not files:
+        parser.error("nothing to import")
+
+    try:
+        import_archives(files, args.config_dir, args.chunksize)
+    except Exception as e:
+        print(f"Import failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+
+from clock import get_clock
+
+
+def last_bar_key(data):
+    closes = data["Close"]
+    return (data.index[-1], len(data), float(closes.iloc[-1]))
+
+
+class IndicatorCache:
+    def __init__(self, maxsize=64, max_age=900):
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute, *args, **kwargs):
+        now = get_clock().monotonic()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created <= self.max_age:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+                self.evictions += 1
+            self.misses += 1
+
+        value = compute(*args, **kwargs)
+
+        with self._lock:
+            self.entries[key] = (now, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+INDICATOR_CACHE = IndicatorCache()
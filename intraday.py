@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from batch_signals import indicators_batch
+from data_quality import DATA_QUALITY
+from resilience import get_fetcher
+from ring_buffer import BarRing
+from rolling_stats import RollingStats, push_returns, push_series
+
+INTRADAY_CAPACITY = {"1m": 780, "5m": 390}
+
+
+def epoch_seconds(index):
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.values.astype("datetime64[s]").astype(np.int64)
+
+
+class IntradayFeed:
+    SYMBOLS = ("^VIX", "^VIX3M", "^GSPC")
+
+    def __init__(self, provider, interval="5m", capacity=None):
+        if interval not in INTRADAY_CAPACITY:
+            raise ValueError(f"Unsupported intraday interval: {interval}")
+        self.provider = provider
+        self.interval = interval
+        self.capacity = capacity or INTRADAY_CAPACITY[interval]
+        self.rings = {symbol: BarRing(self.capacity) for symbol in self.SYMBOLS}
+        self.ratio_stats = RollingStats(self.capacity)
+        self.return_stats = RollingStats(self.capacity)
+
+    def fetch(self, symbol, period, deadline=None):
+        ticker = self.provider.Ticker(symbol)
+        return get_fetcher(self.provider).call(
+            f"{symbol}:{period}:{self.interval}",
+            lambda: ticker.history(period=period, interval=self.interval),
+            deadline,
+        )
+
+    def update(self, deadline=None):
+        updated = 0
+        for symbol, ring in self.rings.items():
+            period = "5d" if len(ring) == 0 else "1d"
+            try:
+                data = self.fetch(symbol, period, deadline)
+            except Exception as e:
+                print(f"Error fetching intraday {symbol}: {e}")
+                continue
+
+            timestamps = epoch_seconds(data.index)
+            closes = data["Close"].to_numpy(dtype=np.float64)
+            valid = ~DATA_QUALITY.bad_intraday_bars(symbol, timestamps, closes)
+            last = ring.last_timestamp()
+            if last is not None:
+                valid &= timestamps >= last
+            ring.extend(timestamps[valid], closes[valid])
+            updated += 1
+
+        if updated == 0:
+            raise ValueError("No intraday market data refreshed")
+        return updated
+
+    def aligned_series(self):
+        vix_ts, vix = self.rings["^VIX"].arrays()
+        vix3m_ts, vix3m = self.rings["^VIX3M"].arrays()
+        common, vix_idx, vix3m_idx = np.intersect1d(
+            vix_ts, vix3m_ts, assume_unique=True, return_indices=True
+        )
+        near = vix[vix_idx]
+        far = vix3m[vix3m_idx]
+        valid = (near > 0) & (far > 0)
+        return common[valid], near[valid], far[valid]
+
+    def ratio_series(self):
+        timestamps, near, far = self.aligned_series()
+        return timestamps, near / far
+
+    def market_data(self):
+        ratio_ts, vix, vix3m = self.aligned_series()
+        spy_ts, spy = self.rings["^GSPC"].arrays()
+
+        if len(vix) == 0 or len(spy) == 0:
+            raise ValueError("No intraday market data available")
+
+        vix_price = float(vix[-1])
+        vix3m_price = float(vix3m[-1])
+        spy_price = float(spy[-1])
+        bar_date = datetime.fromtimestamp(int(ratio_ts[-1]), timezone.utc).date()
+        if vix_price <= 0 or vix3m_price <= 0 or spy_price <= 0:
+            raise ValueError("Invalid price data")
+
+        indicators = indicators_batch([spy])
+        rsi = indicators["rsi"][0]
+        macd_line = indicators["macd_line"][0]
+        signal_line = indicators["signal_line"][0]
+        ma200 = indicators["ma"][0]
+
+        push_series(self.ratio_stats, ratio_ts, vix / vix3m)
+        push_returns(self.return_stats, spy_ts, spy)
+
+        macd_crossover = "neutral"
+        if indicators["crossover"][0] == 1:
+            macd_crossover = "bullish"
+        elif indicators["crossover"][0] == -1:
+            macd_crossover = "bearish"
+
+        return {
+            "vix_price": vix_price,
+            "vix3m_price": vix3m_price,
+            "spy_price": spy_price,
+            "vix_prev": float(vix[-2]) if len(vix) > 1 else vix_price,
+            "vix3m_prev": float(vix3m[-2]) if len(vix3m) > 1 else vix3m_price,
+            "spy_prev": float(spy[-2]) if len(spy) > 1 else spy_price,
+            "ratio": vix_price / vix3m_price,
+            "bar_date": bar_date.isoformat(),
+            "rsi": None if np.isnan(rsi) else float(rsi),
+            "macd_line": None if np.isnan(macd_line) else float(macd_line),
+            "signal_line": None if np.isnan(signal_line) else float(signal_line),
+            "macd_crossover": macd_crossover,
+            "above_ma200": bool(indicators["above_ma"][0]),
+            "ma200_value": None if np.isnan(ma200) else float(ma200),
+            "ratio_zscore": self.ratio_stats.zscore(vix_price / vix3m_price),
+            "return_zscore": self.return_stats.zscore(),
+        }
@@ -0,0 +1,247 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+
+from clock import get_clock
+
+MB = 1024 * 1024
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+
+def windows_rss():
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32")
+    psapi = ctypes.WinDLL("psapi")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [
+        wintypes.HANDLE,
+        ctypes.POINTER(ProcessMemoryCounters),
+        wintypes.DWORD,
+    ]
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(
+        kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+    ):
+        return None
+    return counters.WorkingSetSize
+
+
+def rss_bytes():
+    try:
+        if sys.platform == "win32":
+            return windows_rss()
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def trend_per_hour(points):
+    points = [(t, v) for t, v in points if v is not None]
+    if len(points) < 2:
+        return None
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if var == 0:
+        return None
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return cov / var * 3600
+
+
+def sparkline(values, width=40):
+    values = [v for v in values if v is not None][-width:]
+    if not values:
+        return ""
+    low = min(values)
+    span = max(values) - low
+    if span == 0:
+        return SPARK_BLOCKS[0] * len(values)
+    scale = len(SPARK_BLOCKS) - 1
+    return "".join(SPARK_BLOCKS[round((v - low) / span * scale)] for v in values)
+
+
+def format_mb(value, signed=False):
+    if value is None:
+        return "n/a"
+    return f"{value / MB:+.1f} MB" if signed else f"{value / MB:.1f} MB"
+
+
+class MemoryWatchdog:
+    def __init__(
+        self, name, frames=8, top=10, history=720, streak=5, output_dir="profiles"
+    ):
+        self.name = name
+        self.frames = frames
+        self.top = top
+        self.streak = streak
+        self.output_dir = Path(output_dir)
+        self.samples = deque(maxlen=history)
+        self.baseline = None
+        self.previous = None
+        self.growth = []
+        self.streaks = Counter()
+        self.checkpoints = 0
+        self.checkpoint_time = 0.0
+        self.started_tracing = False
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.baseline is not None
+
+    def start(self):
+        if self.running:
+            return self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.baseline = self.previous = self.take_snapshot()
+        self.record("start")
+        return self
+
+    def stop(self):
+        with self._lock:
+            self.baseline = self.previous = None
+            if self.started_tracing:
+                tracemalloc.stop()
+                self.started_tracing = False
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+
+    def record(self, label):
+        heap, peak = tracemalloc.get_traced_memory()
+        self.samples.append(
+            {
+                "time": get_clock().time(),
+                "label": label,
+                "rss": rss_bytes(),
+                "heap": heap,
+                "peak": peak,
+            }
+        )
+
+    def checkpoint(self, label="refresh"):
+        start = time.perf_counter()
+        with self._lock:
+            if not self.running:
+                return []
+            snapshot = self.take_snapshot()
+            for stat in snapshot.compare_to(self.previous, "lineno"):
+                site = stat.traceback[0]
+                key = (site.filename, site.lineno)
+                if stat.size_diff > 0:
+                    self.streaks[key] += 1
+                else:
+                    self.streaks.pop(key, None)
+            self.growth = [
+                stat
+                for stat in snapshot.compare_to(self.baseline, "lineno")
+                if stat.size_diff > 0
+            ][: self.top]
+            self.previous = snapshot
+            self.record(label)
+            self.checkpoints += 1
+            self.checkpoint_time += time.perf_counter() - start
+        return self.summary()
+
+    def trends(self):
+        samples = list(self.samples)
+        return {
+            field: trend_per_hour([(s["time"], s[field]) for s in samples])
+            for field in ("rss", "heap")
+        }
+
+    def summary(self):
+        samples = list(self.samples)
+        if not samples:
+            return []
+        latest = samples[-1]
+        trends = self.trends()
+        cost = self.checkpoint_time / self.checkpoints if self.checkpoints else 0.0
+        lines = [
+            f"Memory: RSS {format_mb(latest['rss'])} "
+            f"({format_mb(trends['rss'], True)}/h), Python heap "
+            f"{format_mb(latest['heap'])} ({format_mb(trends['heap'], True)}/h), "
+            f"traced peak {format_mb(latest['peak'])}, {self.checkpoints} checkpoints "
+            f"({cost * 1000:.0f} ms each)",
+            f"RSS  {sparkline([s['rss'] for s in samples])}",
+            f"Heap {sparkline([s['heap'] for s in samples])}",
+        ]
+        if self.growth:
+            lines.append("Top growth since start:")
+        for stat in self.growth:
+            site = stat.traceback[0]
+            streak = self.streaks.get((site.filename, site.lineno), 0)
+            note = f", grew {streak} cycles in a row" if streak >= self.streak else ""
+            lines.append(
+                f"  {stat.size_diff / 1024:>+10,.1f} KiB {stat.count_diff:>+8,} blocks  "
+                f"{os.path.basename(site.filename)}:{site.lineno}{note}"
+            )
+        return lines
+
+    def dump(self, path=None):
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = self.output_dir / f"{self.name}-memory-{timestamp}.csv"
+        path = Path(path)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                f.write("time,label,rss,heap,peak\n")
+                for sample in list(self.samples):
+                    f.write(
+                        f"{sample['time']:.3f},{sample['label']},"
+                        f"{sample['rss'] if sample['rss'] is not None else ''},"
+                        f"{sample['heap']},{sample['peak']}\n"
+                    )
+        except Exception as e:
+            print(f"Error writing memory samples to {path}: {e}")
+            return None
+
+        print(f"Memory samples written to {path}")
+        for line in self.summary():
+            print(line)
+        return path
+
+    def stop_and_dump(self, path=None):
+        path = self.dump(path)
+        self.stop()
+        return path
@@ -1,16 +1,113 @@
-import yfinance as yf
-import requests
+import asyncio
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from pathlib import Path
-from functools import lru_cache
 import time
+import sys
+
+import numpy as np
+
+from bars import Bars, as_bars
+from clock import Schedule, get_clock
+from data_quality import DATA_QUALITY
+from indicator_cache import INDICATOR_CACHE
+from profiler import SamplingProfiler
+from resilience import Deadline, get_fetcher
+from rolling_stats import RollingStats, push_returns, push_series
+from snapshot import SnapshotStore
+from term_structure import TERM_SYMBOLS, latest_term_metrics, load_term_structure
+
+
+def align_ratio_history(vix_hist, vix3m_hist, limit=60):
+    dates = []
+    ratios = []
+
+    if vix_hist.empty or vix3m_hist.empty:
+        return dates, ratios
+
+    vix_hist = vix_hist[["Close"]].copy()
+    vix3m_hist = vix3m_hist[["Close"]].copy()
+    vix_hist.index = vix_hist.index.date
+    vix3m_hist.index = vix3m_hist.index.date
+    common_dates = sorted(set(vix_hist.index) & set(vix3m_hist.index))
+    if limit is not None:
+        common_dates = common_dates[-limit:]
+
+    for day in common_dates:
+        vix_val = vix_hist.loc[day, "Close"]
+        vix3m_val = vix3m_hist.loc[day, "Close"]
+        if vix_val > 0 and vix3m_val > 0:
+            ratios.append(vix_val / vix3m_val)
+            dates.append(day)
+
+    return dates, ratios
+
+
+def ratio_bars(vix, vix3m):
+    common, vix_idx, vix3m_idx = np.intersect1d(
+        vix.days, vix3m.days, return_indices=True
+    )
+    near = vix.closes[vix_idx]
+    far = vix3m.closes[vix3m_idx]
+    valid = (near > 0) & (far > 0)
+    return common[valid], near[valid] / far[valid]
+
+
+MARKET_SYMBOLS = (("^VIX", "5d"), ("^VIX3M", "5d"), ("^GSPC", "1y"))
+
+
+def input_fingerprint(*frames):
+    fingerprint = []
+    for data in frames:
+        if data is None or data.empty:
+            fingerprint.append(None)
+            continue
+        closes = data["Close"]
+        fingerprint.append(
+            (
+                len(data),
+                data.index[0],
+                data.index[-1],
+                float(closes.iloc[-1]),
+                float(closes.iloc[-2]) if len(data) > 1 else None,
+            )
+        )
+    return tuple(fingerprint)
 
 
 class ContrarianMonitor:
-    def __init__(self):
-        self.load_credentials()
+    def __init__(self, provider=None, notify=True, interval="1d", recorder=None):
+        if provider is None:
+            import yfinance as yf
+
+            provider = yf
+        self.provider = provider
+        self.recorder = recorder
+        if recorder is not None:
+            from recorder import RecordingProvider
+
+            self.provider = RecordingProvider(self.provider, recorder)
+        self.notify = notify
+        self.interval = interval
+        self.intraday = None
+        self.market_memo = None
+        self.signal_memo = None
+        self.memo_hits = 0
+        self.cycle_deadline = 30
+        self.ratio_stats = RollingStats(252)
+        self.return_stats = RollingStats(252)
+        self.snapshots = SnapshotStore(self.load_market_data, name="market data")
+        if interval != "1d":
+            from intraday import IntradayFeed
+
+            self.intraday = IntradayFeed(self.provider, interval)
+        if notify:
+            self.load_credentials()
+        else:
+            self.bot_token = None
+            self.chat_id = None
+            self.api_url = None
         self.last_signal = None
 
     def load_credentials(self):
@@ -24,10 +121,8 @@ class ContrarianMonitor:
 
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
 
-    @lru_cache(maxsize=16)
-    def calculate_rsi(self, prices_tuple, period=14):
+    def calculate_rsi(self, prices, period=14):
         try:
-            prices = list(prices_tuple)
             if len(prices) < period + 1:
                 return None
 
@@ -52,10 +147,8 @@ class ContrarianMonitor:
             print(f"Error calculating RSI: {e}")
             return None
 
-    @lru_cache(maxsize=16)
-    def calculate_macd(self, prices_tuple):
+    def calculate_macd(self, prices):
         try:
-            prices = list(prices_tuple)
             if len(prices) < 26:
                 return None, None
 
@@ -92,8 +185,23 @@ class ContrarianMonitor:
             print(f"Error calculating MACD: {e}")
             return None, None
 
+    def calculate_ma(self, prices_list, period=200):
+        if len(prices_list) < period:
+            return None
+        return sum(prices_list[-period:]) / period
+
     def calculate_enhanced_signal(
-        self, ratio, vix_price, rsi, macd_crossover, above_ma200, spy_price, ma200_value
+        self,
+        ratio,
+        vix_price,
+        rsi,
+        macd_crossover,
+        above_ma200,
+        spy_price,
+        ma200_value,
+        ratio_zscore=None,
+        return_zscore=None,
+        term_inversion=None,
     ):
         entry_score = 0
         signals = []
@@ -156,6 +264,24 @@ class ContrarianMonitor:
             entry_score += 5
             signals.append("[WATCH] Below 200-MA - Caution")
 
+        if ratio_zscore is not None:
+            if ratio_zscore >= 2:
+                signals.append(
+                    f"[ENTRY] Ratio {ratio_zscore:+.1f} sigma vs 1Y - Unusual fear"
+                )
+            elif ratio_zscore <= -1:
+                signals.append(
+                    f"[WAIT] Ratio {ratio_zscore:+.1f} sigma vs 1Y - Complacent"
+                )
+
+        if term_inversion is not None and term_inversion >= 0.05:
+            signals.append(
+                f"[ENTRY] Term structure inverted {term_inversion:.0%} - Broad fear"
+            )
+
+        if return_zscore is not None and return_zscore <= -2:
+            signals.append(f"[ENTRY] S&P 500 move {return_zscore:+.1f} sigma - Selloff")
+
         entry_score = max(0, min(100, entry_score))
 
         confidence = 50
@@ -193,6 +319,18 @@ class ContrarianMonitor:
         else:
             confidence -= 10
 
+        if ratio_zscore is not None:
+            if ratio_zscore >= 2:
+                confidence += 10
+            elif ratio_zscore <= -1:
+                confidence -= 5
+
+        if return_zscore is not None and return_zscore <= -2:
+            confidence += 5
+
+        if term_inversion is not None and term_inversion >= 0.05:
+            confidence += 5
+
         if entry_signals >= 3:
             confidence += 20
         elif entry_signals >= 2:
@@ -223,63 +361,206 @@ class ContrarianMonitor:
         return action, entry_score, confidence, color, signals, entry_signals
 
     def fetch_market_data(self):
+        snapshot = self.snapshots.refresh()
+        return None if snapshot is None else dict(snapshot.data)
+
+    def load_market_data(self):
         try:
             print("Fetching market data...")
+            if self.recorder is not None:
+                self.recorder.next_cycle()
+
+            deadline = Deadline(self.cycle_deadline)
+            if self.intraday is not None:
+                self.intraday.update(deadline)
+                return self.intraday.market_data()
+
+            if self.ratio_stats.last_key is None:
+                self.seed_ratio_stats(deadline)
+            frames = [
+                self.fetch_bars(symbol, period, deadline)
+                for symbol, period in MARKET_SYMBOLS
+            ]
+            market_data = self.compute_market_data(*frames)
+            market_data.update(latest_term_metrics(self.provider, deadline=deadline))
+            return market_data
 
-            vix = yf.Ticker("^VIX")
-            vix3m = yf.Ticker("^VIX3M")
-            spy = yf.Ticker("^GSPC")
-
-            vix_data = vix.history(period="5d")
-            vix3m_data = vix3m.history(period="5d")
-            spy_data = spy.history(period="1y")
-
-            if vix_data.empty or vix3m_data.empty or spy_data.empty:
-                raise ValueError("No market data available")
-
-            vix_price = float(vix_data["Close"].iloc[-1])
-            vix3m_price = float(vix3m_data["Close"].iloc[-1])
-            spy_price = float(spy_data["Close"].iloc[-1])
-
-            if vix_price <= 0 or vix3m_price <= 0 or spy_price <= 0:
-                raise ValueError("Invalid price data")
-
-            ratio = vix_price / vix3m_price
-
-            prices_list = spy_data["Close"].tolist()
-            prices_tuple = tuple(prices_list)
-
-            rsi_value = self.calculate_rsi(prices_tuple, period=14)
-            macd_line, signal_line = self.calculate_macd(prices_tuple)
-
-            macd_crossover = "neutral"
-            if macd_line is not None and signal_line is not None:
-                if macd_line > signal_line:
-                    macd_crossover = "bullish"
-                elif macd_line < signal_line:
-                    macd_crossover = "bearish"
-
-            ma200_value = None
-            above_ma200 = False
-            if len(prices_list) >= 200:
-                ma200_value = sum(prices_list[-200:]) / 200
-                above_ma200 = spy_price > ma200_value
-
-            return {
-                "vix_price": vix_price,
-                "vix3m_price": vix3m_price,
-                "spy_price": spy_price,
-                "ratio": ratio,
-                "rsi": rsi_value,
-                "macd_crossover": macd_crossover,
-                "above_ma200": above_ma200,
-                "ma200_value": ma200_value,
-            }
+        except Exception as e:
+            print(f"Error fetching market data: {e}")
+            return None
+
+    async def load_market_data_async(self, max_concurrency=3):
+        try:
+            print("Fetching market data...")
+            if self.recorder is not None:
+                self.recorder.next_cycle()
+
+            deadline = Deadline(self.cycle_deadline)
+            if self.intraday is not None:
+                await asyncio.to_thread(self.intraday.update, deadline)
+                return self.intraday.market_data()
+
+            if self.ratio_stats.last_key is None:
+                await asyncio.to_thread(self.seed_ratio_stats, deadline)
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def fetch(symbol, period):
+                async with semaphore:
+                    return await asyncio.to_thread(
+                        self.fetch_bars, symbol, period, deadline
+                    )
+
+            async def fetch_term():
+                async with semaphore:
+                    return await asyncio.to_thread(
+                        latest_term_metrics, self.provider, deadline=deadline
+                    )
+
+            *frames, term = await asyncio.wait_for(
+                asyncio.gather(*(fetch(s, p) for s, p in MARKET_SYMBOLS), fetch_term()),
+                deadline.remaining(),
+            )
+            market_data = await asyncio.to_thread(self.compute_market_data, *frames)
+            market_data.update(term)
+            return market_data
 
         except Exception as e:
             print(f"Error fetching market data: {e}")
             return None
 
+    async def fetch_market_data_async(self):
+        snapshot = self.snapshots.update(await self.load_market_data_async())
+        return None if snapshot is None else dict(snapshot.data)
+
+    def fetch_bars(self, symbol, period, deadline=None):
+        ticker = self.provider.Ticker(symbol)
+        return get_fetcher(self.provider).call(
+            f"{symbol}:{period}",
+            lambda: as_bars(ticker.history(period=period)),
+            deadline,
+        )
+
+    def seed_ratio_stats(self, deadline=None):
+        try:
+            days, curve, _ = load_term_structure(self.provider, deadline=deadline)
+            vix_hist, vix3m_hist = (
+                DATA_QUALITY.check_bars(
+                    symbol, Bars(days, curve[:, TERM_SYMBOLS.index(symbol)])
+                )
+                for symbol in ("^VIX", "^VIX3M")
+            )
+            self.update_ratio_stats(vix_hist, vix3m_hist)
+        except Exception as e:
+            print(f"Error seeding ratio statistics: {e}")
+
+    def update_ratio_stats(self, vix, vix3m):
+        push_series(self.ratio_stats, *ratio_bars(vix, vix3m))
+
+    def compute_market_data(self, vix, vix3m, spy):
+        vix, vix3m, spy = as_bars(vix), as_bars(vix3m), as_bars(spy)
+        if vix.empty or vix3m.empty or spy.empty:
+            raise ValueError("No market data available")
+
+        fingerprint = (vix.fingerprint(), vix3m.fingerprint(), spy.fingerprint())
+        if self.market_memo is not None and self.market_memo[0] == fingerprint:
+            self.memo_hits += 1
+            return dict(self.market_memo[1])
+
+        vix, vix3m, spy = DATA_QUALITY.clean_market_bars(vix, vix3m, spy)
+        if vix.empty or vix3m.empty or spy.empty:
+            raise ValueError("No usable market data after quality checks")
+
+        vix_price = vix.last()
+        vix3m_price = vix3m.last()
+        spy_price = spy.last()
+
+        if vix_price <= 0 or vix3m_price <= 0 or spy_price <= 0:
+            raise ValueError("Invalid price data")
+
+        ratio = vix_price / vix3m_price
+        bar_date = date.fromordinal(int(min(vix.days[-1], vix3m.days[-1])))
+
+        vix_prev = vix.last(2) if len(vix) > 1 else vix_price
+        vix3m_prev = vix3m.last(2) if len(vix3m) > 1 else vix3m_price
+        spy_prev = spy.last(2) if len(spy) > 1 else spy_price
+
+        prices_list = spy.closes.tolist()
+        bar_key = ("^GSPC", self.interval, spy.key())
+
+        rsi_value = INDICATOR_CACHE.get_or_compute(
+            bar_key + ("rsi", 14), self.calculate_rsi, prices_list, period=14
+        )
+        macd_line, signal_line = INDICATOR_CACHE.get_or_compute(
+            bar_key + ("macd", 12, 26, 9), self.calculate_macd, prices_list
+        )
+
+        macd_crossover = "neutral"
+        if macd_line is not None and signal_line is not None:
+            if macd_line > signal_line:
+                macd_crossover = "bullish"
+            elif macd_line < signal_line:
+                macd_crossover = "bearish"
+
+        ma200_value = self.calculate_ma(prices_list, period=200)
+        above_ma200 = ma200_value is not None and spy_price > ma200_value
+
+        self.update_ratio_stats(vix, vix3m)
+        push_returns(self.return_stats, spy.days, spy.closes)
+
+        market_data = {
+            "vix_price": vix_price,
+            "vix3m_price": vix3m_price,
+            "spy_price": spy_price,
+            "vix_prev": vix_prev,
+            "vix3m_prev": vix3m_prev,
+            "spy_prev": spy_prev,
+            "ratio": ratio,
+            "bar_date": bar_date.isoformat(),
+            "rsi": rsi_value,
+            "macd_line": macd_line,
+            "signal_line": signal_line,
+            "macd_crossover": macd_crossover,
+            "above_ma200": above_ma200,
+            "ma200_value": ma200_value,
+            "ratio_zscore": self.ratio_stats.zscore(ratio),
+            "return_zscore": self.return_stats.zscore(),
+        }
+        self.market_memo = (fingerprint, market_data)
+        return dict(market_data)
+
+    def fetch_ratio_history(self, days=75, limit=60):
+        try:
+            end_date = get_clock().now()
+            start_date = end_date - timedelta(days=days)
+
+            vix = as_bars(
+                self.provider.Ticker("^VIX").history(start=start_date, end=end_date)
+            )
+            vix3m = as_bars(
+                self.provider.Ticker("^VIX3M").history(start=start_date, end=end_date)
+            )
+            days, ratios = ratio_bars(vix, vix3m)
+            if limit is not None:
+                days, ratios = days[-limit:], ratios[-limit:]
+            return [date.fromordinal(int(day)) for day in days], ratios.tolist()
+        except Exception as e:
+            print(f"Error loading historical data: {e}")
+            return [], []
+
+    def evaluate_signal(self, market_data):
+        return self.calculate_enhanced_signal(
+            market_data["ratio"],
+            market_data["vix_price"],
+            market_data["rsi"],
+            market_data["macd_crossover"],
+            market_data["above_ma200"],
+            market_data["spy_price"],
+            market_data["ma200_value"],
+            market_data.get("ratio_zscore"),
+            market_data.get("return_zscore"),
+            market_data.get("term_inversion"),
+        )
+
     def send_telegram_notification(
         self,
         signal_type,
@@ -291,7 +572,9 @@ class ContrarianMonitor:
         spy_price,
     ):
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            import requests
+
+            timestamp = get_clock().now().strftime("%Y-%m-%d %H:%M:%S")
 
             if signal_type == "STRONG BUY":
                 emoji = "🚨"
@@ -335,67 +618,150 @@ class ContrarianMonitor:
 
     def check_and_notify(self):
         try:
-            print(f"Checking market conditions at {datetime.now()}")
+            print(f"Checking market conditions at {get_clock().now()}")
 
             market_data = self.fetch_market_data()
-            if not market_data:
-                print("Failed to fetch market data")
+            if not self.is_fresh(market_data):
                 return False
 
-            signal_result = self.calculate_enhanced_signal(
-                market_data["ratio"],
-                market_data["vix_price"],
-                market_data["rsi"],
-                market_data["macd_crossover"],
-                market_data["above_ma200"],
-                market_data["spy_price"],
-                market_data["ma200_value"],
-            )
-
-            signal_action, entry_score, confidence, color, signals, entry_signals = (
-                signal_result
-            )
+            signal_result = self.signal_for(market_data)
+            if self.should_notify(signal_result[0]):
+                self.notify_signal(market_data, signal_result)
+            return True
 
-            print(
-                f"Current signal: {signal_action} (Score: {entry_score}, Confidence: {confidence}%)"
-            )
+        except Exception as e:
+            print(f"Error in monitoring: {e}")
+            return False
 
-            if (
-                signal_action in ["BUY", "STRONG BUY"]
-                and signal_action != self.last_signal
-            ):
-                print(f"New {signal_action} signal detected!")
-                success = self.send_telegram_notification(
-                    signal_action,
-                    confidence,
-                    entry_score,
-                    market_data["ratio"],
-                    market_data["vix_price"],
-                    market_data["vix3m_price"],
-                    market_data["spy_price"],
-                )
+    async def check_and_notify_async(self):
+        try:
+            print(f"Checking market conditions at {get_clock().now()}")
 
-                if success:
-                    self.last_signal = signal_action
-                    print(f"Notification sent for {signal_action}")
-                else:
-                    print("Failed to send notification")
-            else:
-                print(f"No new buy signal (current: {signal_action})")
+            market_data = await self.fetch_market_data_async()
+            if not self.is_fresh(market_data):
+                return False
 
+            signal_result = self.signal_for(market_data)
+            if self.should_notify(signal_result[0]):
+                await asyncio.to_thread(self.notify_signal, market_data, signal_result)
             return True
 
         except Exception as e:
             print(f"Error in monitoring: {e}")
             return False
 
+    def is_fresh(self, market_data):
+        if not market_data:
+            print("Failed to fetch market data")
+            return False
+        if self.snapshots.stale:
+            print(
+                f"Not alerting on market data from "
+                f"{self.snapshots.current().describe_age()} (refresh failed: "
+                f"{self.snapshots.last_error})"
+            )
+            return False
+        return True
 
-def main():
+    def signal_for(self, market_data):
+        if self.signal_memo is not None and self.signal_memo[0] == market_data:
+            signal_result = self.signal_memo[1]
+        else:
+            signal_result = self.evaluate_signal(market_data)
+            self.signal_memo = (market_data, signal_result)
+
+        signal_action, entry_score, confidence = signal_result[:3]
+        print(
+            f"Current signal: {signal_action} (Score: {entry_score}, Confidence: {confidence}%)"
+        )
+        return signal_result
+
+    def should_notify(self, signal_action):
+        if (
+            self.notify
+            and signal_action in ["BUY", "STRONG BUY"]
+            and signal_action != self.last_signal
+        ):
+            return True
+        print(f"No new buy signal (current: {signal_action})")
+        return False
+
+    def notify_signal(self, market_data, signal_result):
+        signal_action, entry_score, confidence = signal_result[:3]
+        print(f"New {signal_action} signal detected!")
+        success = self.send_telegram_notification(
+            signal_action,
+            confidence,
+            entry_score,
+            market_data["ratio"],
+            market_data["vix_price"],
+            market_data["vix3m_price"],
+            market_data["spy_price"],
+        )
+
+        if success:
+            self.last_signal = signal_action
+            print(f"Notification sent for {signal_action}")
+        else:
+            print("Failed to send notification")
+        return success
+
+    def run(self, every=60, cycles=None, stop_event=None):
+        schedule = Schedule(every)
+        completed = 0
+        while cycles is None or completed < cycles:
+            if get_clock().sleep(schedule.due_in(), stop_event):
+                break
+            schedule.mark_run()
+            self.check_and_notify()
+            completed += 1
+        return completed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
     print("🤖 Contrarian Edge 24/7 Monitor Starting...")
 
+    interval = "1d"
+    if "--interval" in argv[:-1]:
+        interval = argv[argv.index("--interval") + 1]
+
+    every = None
+    if "--every" in argv[:-1]:
+        every = float(argv[argv.index("--every") + 1])
+
+    profiler = None
+    if "--profile" in argv or os.getenv("CONTRARIAN_PROFILE"):
+        profiler = SamplingProfiler("monitor", interval=0.005).start()
+
+    recorder = None
+    if "--record" in argv or os.getenv("CONTRARIAN_RECORD"):
+        from recorder import DEFAULT_ARCHIVE, FrameRecorder
+
+        recorder = FrameRecorder(os.getenv("CONTRARIAN_RECORD") or DEFAULT_ARCHIVE)
+
+    provider = None
+    bars_dir = os.getenv("CONTRARIAN_BARS")
+    if "--bars" in argv[:-1]:
+        bars_dir = argv[argv.index("--bars") + 1]
+    if bars_dir:
+        from bar_store import BarStore, StoreProvider
+
+        provider = StoreProvider(BarStore(bars_dir))
+
     try:
-        monitor = ContrarianMonitor()
-        success = monitor.check_and_notify()
+        monitor = ContrarianMonitor(
+            provider=provider, interval=interval, recorder=recorder
+        )
+        if every is not None:
+            print(f"Running a monitoring cycle every {every:g}s (Ctrl+C to stop)")
+            try:
+                monitor.run(every)
+            except KeyboardInterrupt:
+                pass
+            return 0
+
+        success = asyncio.run(monitor.check_and_notify_async())
 
         if success:
             print("✅ Monitoring cycle completed successfully")
@@ -405,6 +771,9 @@ def main():
     except Exception as e:
         print(f"❌ Fatal error: {e}")
         return 1
+    finally:
+        if profiler is not None:
+            profiler.stop_and_dump()
 
     return 0
 
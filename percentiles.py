@@ -0,0 +1,84 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+PERCENTILE_WINDOWS = {"1Y": 252, "5Y": 1260, "All": None}
+
+
+class PercentileIndex:
+    def __init__(self, window=None):
+        self.window = window
+        self.sorted_values = []
+        self.order = deque()
+
+    def __len__(self):
+        return len(self.sorted_values)
+
+    def clear(self):
+        self.sorted_values.clear()
+        self.order.clear()
+
+    def add(self, value):
+        insort(self.sorted_values, value)
+        self.order.append(value)
+        if self.window is not None and len(self.order) > self.window:
+            self.remove(self.order.popleft())
+
+    def remove(self, value):
+        del self.sorted_values[bisect_left(self.sorted_values, value)]
+
+    def replace_last(self, value):
+        if not self.order:
+            self.add(value)
+            return
+        self.remove(self.order.pop())
+        insort(self.sorted_values, value)
+        self.order.append(value)
+
+    def percentile(self, value):
+        count = len(self.sorted_values)
+        if count == 0:
+            return None
+        below = bisect_left(self.sorted_values, value)
+        at_or_below = bisect_right(self.sorted_values, value)
+        return 100.0 * (below + at_or_below) / (2 * count)
+
+    def quantile(self, q):
+        if not self.sorted_values:
+            return None
+        return self.sorted_values[round(q * (len(self.sorted_values) - 1))]
+
+
+class RatioPercentiles:
+    def __init__(self, windows=None, capacity=None):
+        windows = PERCENTILE_WINDOWS if windows is None else windows
+        self.indexes = {
+            name: PercentileIndex(capacity if window is None else window)
+            for name, window in windows.items()
+        }
+
+    def clear(self):
+        for index in self.indexes.values():
+            index.clear()
+
+    def add(self, value):
+        for index in self.indexes.values():
+            index.add(value)
+
+    def replace_last(self, value):
+        for index in self.indexes.values():
+            index.replace_last(value)
+
+    def rebuild(self, values):
+        self.clear()
+        for value in values:
+            self.add(float(value))
+
+    def percentile(self, value, window="All"):
+        return self.indexes[window].percentile(value)
+
+    def percentiles(self, value):
+        return {name: index.percentile(value) for name, index in self.indexes.items()}
+
+    def range(self, window="All"):
+        index = self.indexes[window]
+        return index.quantile(0.0), index.quantile(1.0)
@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+
+class SamplingProfiler:
+    def __init__(self, name, interval=0.01, output_dir="profiles", max_depth=64):
+        self.name = name
+        self.interval = interval
+        self.output_dir = Path(output_dir)
+        self.max_depth = max_depth
+        self.max_stacks = 50000
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.sampling_time = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+
+        self._stop_event.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            sample_start = time.perf_counter()
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+
+            with self._lock:
+                for ident, frame in frames.items():
+                    if ident == own_ident:
+                        continue
+                    stack = self._collapse(frame, thread_names.get(ident, str(ident)))
+                    if stack in self.stacks or len(self.stacks) < self.max_stacks:
+                        self.stacks[stack] += 1
+                    else:
+                        self.stacks[(stack[0], "[truncated]")] += 1
+                self.samples += 1
+                self.sampling_time += time.perf_counter() - sample_start
+
+            del frames
+
+    def _collapse(self, frame, thread_name):
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        names.append(thread_name)
+        names.reverse()
+        return tuple(names)
+
+    def collapsed_lines(self):
+        with self._lock:
+            items = sorted(self.stacks.items(), key=lambda item: -item[1])
+        return [f"{';'.join(stack)} {count}" for stack, count in items]
+
+    def top_functions(self, limit=15):
+        totals = Counter()
+        with self._lock:
+            for stack, count in self.stacks.items():
+                totals[stack[-1]] += count
+        return totals.most_common(limit)
+
+    def dump(self, path=None):
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = self.output_dir / f"{self.name}-{timestamp}.collapsed"
+        path = Path(path)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                for line in self.collapsed_lines():
+                    f.write(line + "\n")
+        except Exception as e:
+            print(f"Error writing profile to {path}: {e}")
+            return None
+
+        duration = time.time() - self.started_at if self.started_at else 0.0
+        overhead = (self.sampling_time / duration * 100) if duration else 0.0
+        print(
+            f"Profile written to {path} ({self.samples} samples over {duration:.1f}s, "
+            f"sampler overhead {overhead:.2f}%)"
+        )
+        for function, count in self.top_functions(10):
+            print(f"  {count:>7}  {function}")
+        return path
+
+    def stop_and_dump(self, path=None):
+        self.stop()
+        return self.dump(path)
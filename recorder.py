@@ -0,0 +1,304 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import struct
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from clock import get_clock
+
+DEFAULT_ARCHIVE = Path("recordings") / "market_frames.bin"
+MAGIC = b"CEF1"
+HEADER = struct.Struct("<4sdqIHHHI")
+
+
+def request_key(period=None, start=None, end=None, interval="1d", **kwargs):
+    parts = [
+        f"{name}={value}"
+        for name, value in (("period", period), ("start", start), ("end", end))
+        if value is not None
+    ]
+    if interval != "1d":
+        parts.append(f"interval={interval}")
+    return ";".join(parts)
+
+
+def encode_record(recorded_at, cycle, symbol, request, frame):
+    numeric = frame.select_dtypes("number")
+    index = frame.index
+    tz = "" if getattr(index, "tz", None) is None else str(index.tz)
+    stamps = np.asarray(index.values, dtype="datetime64[ns]").view(np.int64)
+    values = np.ascontiguousarray(numeric.to_numpy(dtype=np.float64))
+    meta = "\x1f".join([tz, *map(str, numeric.columns)]).encode("utf-8")
+    payload = zlib.compress(stamps.tobytes() + values.tobytes(), 6)
+    symbol = symbol.encode("utf-8")
+    request = request.encode("utf-8")
+    header = HEADER.pack(
+        MAGIC,
+        recorded_at,
+        cycle,
+        len(frame),
+        len(symbol),
+        len(request),
+        len(meta),
+        len(payload),
+    )
+    return b"".join((header, symbol, request, meta, payload))
+
+
+def decode_frame(rows, meta, payload):
+    tz, *columns = meta.decode("utf-8").split("\x1f")
+    raw = zlib.decompress(payload)
+    stamps = np.frombuffer(raw, dtype=np.int64, count=rows)
+    values = np.frombuffer(raw, dtype=np.float64, offset=rows * 8)
+    index = pd.DatetimeIndex(stamps.astype("datetime64[ns]"))
+    if tz:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    return pd.DataFrame(
+        values.reshape(rows, len(columns)).copy(), index=index, columns=columns
+    )
+
+
+class FrameRecorder:
+    def __init__(self, path=DEFAULT_ARCHIVE, max_bytes=32 * 1024 * 1024, segments=8):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.segments = segments
+        self.cycle = 0
+        self.records = 0
+        self._lock = threading.Lock()
+
+    def segment(self, number):
+        if number == 0:
+            return self.path
+        return self.path.with_name(f"{self.path.name}.{number}")
+
+    def next_cycle(self):
+        with self._lock:
+            self.cycle = max(self.cycle + 1, int(get_clock().time() * 1000))
+            return self.cycle
+
+    def _roll(self):
+        for number in range(self.segments - 1, 0, -1):
+            source = self.segment(number - 1)
+            if source.exists():
+                os.replace(source, self.segment(number))
+
+    def record(self, symbol, request, frame):
+        if not isinstance(getattr(frame, "index", None), pd.DatetimeIndex):
+            return False
+        try:
+            blob = encode_record(get_clock().time(), self.cycle, symbol, request, frame)
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if (
+                    self.path.exists()
+                    and self.path.stat().st_size + len(blob) > self.max_bytes
+                ):
+                    self._roll()
+                with open(self.path, "ab") as f:
+                    f.write(blob)
+                self.records += 1
+            return True
+        except Exception as e:
+            print(f"Error recording {symbol} frame: {e}")
+            return False
+
+
+class RecordingTicker:
+    def __init__(self, ticker, symbol, recorder):
+        self.ticker = ticker
+        self.symbol = symbol
+        self.recorder = recorder
+
+    def history(self, **kwargs):
+        data = self.ticker.history(**kwargs)
+        self.recorder.record(self.symbol, request_key(**kwargs), data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self.ticker, name)
+
+
+class RecordingProvider:
+    def __init__(self, provider, recorder):
+        self.provider = provider
+        self.recorder = recorder
+
+    @property
+    def upstream(self):
+        return self.provider
+
+    def Ticker(self, symbol):
+        return RecordingTicker(self.provider.Ticker(symbol), symbol, self.recorder)
+
+    def __getattr__(self, name):
+        attr = getattr(self.provider, name)
+        if name != "download":
+            return attr
+
+        def download(tickers, **kwargs):
+            data = attr(tickers, **kwargs)
+            key = request_key(**kwargs)
+            for symbol in [tickers] if isinstance(tickers, str) else tickers:
+                try:
+                    self.recorder.record(symbol, key, data[symbol].dropna(how="all"))
+                except KeyError:
+                    pass
+            return data
+
+        return download
+
+
+def read_archive(path):
+    path = Path(path)
+    segments = sorted(
+        (p for p in path.parent.glob(path.name + ".*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]),
+        reverse=True,
+    )
+    if path.exists():
+        segments.append(path)
+
+    for segment in segments:
+        with open(segment, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset + HEADER.size <= len(data):
+            magic, recorded_at, cycle, rows, *lengths = HEADER.unpack_from(data, offset)
+            start = offset + HEADER.size
+            end = start + sum(lengths)
+            if magic != MAGIC or end > len(data):
+                print(f"Stopping at damaged record in {segment} (offset {offset})")
+                break
+            fields = []
+            for length in lengths:
+                fields.append(data[start : start + length])
+                start += length
+            symbol, request, meta, payload = fields
+            frame = decode_frame(rows, meta, payload)
+            yield recorded_at, cycle, symbol.decode(), request.decode(), frame
+            offset = end
+
+
+def load_cycles(path):
+    cycles = []
+    current = None
+    for record in read_archive(path):
+        if current is None or record[1] != current:
+            cycles.append([])
+            current = record[1]
+        cycles[-1].append(record)
+    return cycles
+
+
+class ArchiveTicker:
+    def __init__(self, provider, symbol):
+        self.provider = provider
+        self.symbol = symbol
+
+    def history(self, **kwargs):
+        return self.provider.next_frame(self.symbol, request_key(**kwargs))
+
+
+class ArchiveProvider:
+    def __init__(self):
+        self.frames = {}
+        self._lock = threading.Lock()
+
+    def load_cycle(self, records):
+        frames = {}
+        for _, _, symbol, request, frame in records:
+            frames.setdefault((symbol, request), []).append(frame)
+        with self._lock:
+            self.frames = frames
+
+    def next_frame(self, symbol, request):
+        with self._lock:
+            queue = self.frames.get((symbol, request))
+            if not queue:
+                return pd.DataFrame(columns=["Close"])
+            return queue.pop(0) if len(queue) > 1 else queue[0]
+
+    def Ticker(self, symbol):
+        return ArchiveTicker(self, symbol)
+
+
+def replay(path, interval="1d", use_async=False):
+    from monitor import MARKET_SYMBOLS, ContrarianMonitor
+    from resilience import CircuitBreaker, get_fetcher
+    from term_structure import TERM_CACHE, TERM_SYMBOLS
+
+    cycles = load_cycles(path)
+    provider = ArchiveProvider()
+    monitor = ContrarianMonitor(provider=provider, notify=False, interval=interval)
+    for channel in ("market", "term"):
+        fetcher = get_fetcher(provider, channel)
+        fetcher.retries = 1
+        fetcher.breaker = CircuitBreaker(failure_threshold=sys.maxsize)
+
+    term_only = set(TERM_SYMBOLS) - {symbol for symbol, _ in MARKET_SYMBOLS}
+    timings = []
+    results = []
+    for records in cycles:
+        provider.load_cycle(records)
+        if any(record[2] in term_only for record in records):
+            TERM_CACHE.clear()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if use_async:
+                ok = asyncio.run(monitor.check_and_notify_async())
+            else:
+                ok = monitor.check_and_notify()
+        timings.append((time.perf_counter() - start) * 1000)
+        signal = monitor.signal_memo[1] if ok and monitor.signal_memo else None
+        results.append((records[0][0], signal))
+    return timings, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded frame archive through the monitor cycle"
+    )
+    parser.add_argument("archive", nargs="?", default=str(DEFAULT_ARCHIVE))
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    args = parser.parse_args(argv)
+
+    timings, results = replay(args.archive, args.interval, args.use_async)
+    if not timings:
+        print(f"No recorded cycles in {args.archive}")
+        return 1
+
+    previous = None
+    for recorded_at, signal in results:
+        action = signal[0] if signal else "FAILED"
+        if action != previous:
+            when = datetime.fromtimestamp(recorded_at).isoformat(timespec="seconds")
+            detail = (
+                f" (Score: {signal[1]}, Confidence: {signal[2]}%)" if signal else ""
+            )
+            print(f"{when}  {action}{detail}")
+            previous = action
+
+    total = sum(timings)
+    print(
+        f"Replayed {len(timings)} cycles in {total:.1f} ms "
+        f"(median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms, "
+        f"{len(timings) / (total / 1000):.0f} cycles/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
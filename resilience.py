@@ -0,0 +1,175 @@
+import random
+import threading
+import weakref
+
+from clock import get_clock
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = get_clock().monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - get_clock().monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=3, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if get_clock().monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = get_clock().monotonic()
+            self.probing = False
+
+    def release_probe(self):
+        with self._lock:
+            self.probing = False
+
+
+class ResilientFetcher:
+    def __init__(
+        self,
+        name,
+        retries=3,
+        base_delay=0.5,
+        max_delay=8.0,
+        failure_threshold=3,
+        reset_timeout=60,
+    ):
+        self.name = name
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.last_good = {}
+        self.backoffs = 0
+        self.backoff_seconds = 0.0
+        self.fallbacks = 0
+        self._stop_event = threading.Event()
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def stop(self):
+        self._stop_event.set()
+
+    def fallback(self, key, error):
+        if key in self.last_good:
+            self.fallbacks += 1
+            print(f"{self.name}: serving last good data for {key} ({error})")
+            return self.last_good[key]
+        raise error
+
+    def call(self, key, fetch, deadline=None):
+        if not self.breaker.allow():
+            return self.fallback(key, CircuitOpenError(f"{self.name} circuit is open"))
+        try:
+            return self._attempt(key, fetch, deadline)
+        finally:
+            self.breaker.release_probe()
+
+    def _attempt(self, key, fetch, deadline):
+        error = None
+        for attempt in range(self.retries):
+            if deadline is not None and deadline.expired():
+                if attempt == 0:
+                    return self.fallback(
+                        key, DeadlineExceeded(f"Cycle deadline reached fetching {key}")
+                    )
+                break
+            try:
+                data = fetch()
+                if data is not None and not getattr(data, "empty", False):
+                    self.breaker.record_success()
+                    self.last_good[key] = data
+                    return data
+                error = ValueError(f"No data available for {key}")
+            except Exception as e:
+                error = e
+
+            if attempt < self.retries - 1:
+                delay = self.backoff(attempt)
+                if deadline is not None:
+                    delay = min(delay, deadline.remaining())
+                self.backoffs += 1
+                self.backoff_seconds += delay
+                if get_clock().sleep(delay, self._stop_event):
+                    break
+
+        self.breaker.record_failure()
+        return self.fallback(key, error)
+
+    def stats(self):
+        return {
+            "breaker": self.breaker.state,
+            "failures": self.breaker.failures,
+            "backoffs": self.backoffs,
+            "backoff_seconds": self.backoff_seconds,
+            "fallbacks": self.fallbacks,
+        }
+
+
+_fetchers = weakref.WeakKeyDictionary()
+_fetchers_lock = threading.Lock()
+
+
+def upstream_provider(provider):
+    while getattr(provider, "upstream", None) is not None:
+        provider = provider.upstream
+    return provider
+
+
+def get_fetcher(provider, channel="market"):
+    provider = upstream_provider(provider)
+    with _fetchers_lock:
+        fetchers = _fetchers.setdefault(provider, {})
+        if channel not in fetchers:
+            name = getattr(provider, "__name__", type(provider).__name__)
+            if channel != "market":
+                name = f"{name} {channel}"
+            fetchers[channel] = ResilientFetcher(name)
+        return fetchers[channel]
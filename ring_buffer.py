@@ -0,0 +1,157 @@
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from percentiles import RatioPercentiles
+from rolling_stats import RollingStats, push_series
+
+CHART_HISTORY_CAPACITY = 8192
+
+
+class BarRing:
+    def __init__(self, capacity, key_dtype=np.int64):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=key_dtype)
+        self.closes = np.zeros(capacity, dtype=np.float64)
+        self.start = 0
+        self.size = 0
+        self.version = 0
+
+    def __len__(self):
+        return self.size
+
+    def _index(self, offset):
+        return (self.start + offset) % self.capacity
+
+    def last_timestamp(self):
+        if self.size == 0:
+            return None
+        return int(self.timestamps[self._index(self.size - 1)])
+
+    def append(self, timestamp, close):
+        last = self.last_timestamp()
+        if last is not None and timestamp < last:
+            return False
+
+        if last is not None and timestamp == last:
+            index = self._index(self.size - 1)
+            if self.closes[index] != close:
+                self.closes[index] = close
+                self.version += 1
+            return True
+
+        index = self._index(self.size)
+        self.timestamps[index] = timestamp
+        self.closes[index] = close
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        self.version += 1
+        return True
+
+    def extend(self, timestamps, closes):
+        for timestamp, close in zip(timestamps, closes):
+            self.append(int(timestamp), float(close))
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+        self.version += 1
+
+    def arrays(self):
+        order = (self.start + np.arange(self.size)) % self.capacity
+        return self.timestamps[order], self.closes[order]
+
+
+class RatioHistory(BarRing):
+    def __init__(self, capacity=60, percentile_windows=None, zscore_window=None):
+        super().__init__(capacity, key_dtype=np.int32)
+        self.percentiles = None
+        self.stats = None
+        if percentile_windows is not None:
+            self.percentiles = RatioPercentiles(percentile_windows, capacity)
+        if zscore_window is not None:
+            self.stats = RollingStats(zscore_window)
+
+    def append(self, day, ratio):
+        ordinal = day.toordinal()
+        replaces_last = ordinal == self.last_timestamp()
+        added = super().append(ordinal, ratio)
+        if added and self.percentiles is not None:
+            if replaces_last:
+                self.percentiles.replace_last(ratio)
+            else:
+                self.percentiles.add(ratio)
+        if added and self.stats is not None:
+            self.stats.update(ordinal, ratio)
+        return added
+
+    def clear(self):
+        super().clear()
+        if getattr(self, "percentiles", None) is not None:
+            self.percentiles.clear()
+        if getattr(self, "stats", None) is not None:
+            self.stats.clear()
+
+    def extend(self, dates, ratios):
+        for day, ratio in zip(dates, ratios):
+            self.append(day, float(ratio))
+
+    def last_date(self):
+        last = self.last_timestamp()
+        return None if last is None else date.fromordinal(last)
+
+    def values(self):
+        return self.arrays()[1]
+
+    def dates(self):
+        return [date.fromordinal(int(day)) for day in self.arrays()[0]]
+
+    def first_date(self):
+        if self.size == 0:
+            return None
+        return date.fromordinal(int(self.timestamps[self.start]))
+
+    def merge(self, dates, ratios):
+        combined = dict(zip(self.dates(), self.values().tolist()))
+        combined.update((day, float(ratio)) for day, ratio in zip(dates, ratios))
+        self.clear()
+        for day in sorted(combined)[-self.capacity :]:
+            self.append(day, combined[day])
+
+    def save(self, path):
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            days, values = self.arrays()
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, days=days, values=values)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"Error saving ratio history to {path}: {e}")
+            return False
+
+    def load(self, path):
+        path = Path(path)
+        if not path.exists():
+            return False
+        try:
+            with np.load(path) as data:
+                days = data["days"]
+                values = data["values"]
+            self.clear()
+            for day, value in zip(days[-self.capacity :], values[-self.capacity :]):
+                BarRing.append(self, int(day), float(value))
+            if self.percentiles is not None:
+                self.percentiles.rebuild(self.values())
+            if self.stats is not None:
+                push_series(self.stats, *self.arrays())
+            return True
+        except Exception as e:
+            print(f"Error loading ratio history from {path}: {e}")
+            return False
@@ -0,0 +1,121 @@
+import math
+from collections import deque
+
+import numpy as np
+
+
+class RollingStats:
+    def __init__(self, window=252, min_count=20):
+        self.window = window
+        self.min_count = min_count
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last_key = None
+        self.updates = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def clear(self):
+        self.values.clear()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last_key = None
+
+    def _add(self, value):
+        self.values.append(value)
+        count = len(self.values)
+        delta = value - self.mean
+        self.mean += delta / count
+        self.m2 += delta * (value - self.mean)
+
+    def _remove(self, value):
+        count = len(self.values)
+        if count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / count
+        self.m2 -= delta * (value - self.mean)
+
+    def _resync(self):
+        values = np.fromiter(self.values, dtype=np.float64, count=len(self.values))
+        self.mean = float(values.mean()) if len(values) else 0.0
+        self.m2 = float(((values - self.mean) ** 2).sum()) if len(values) else 0.0
+
+    def push(self, value):
+        value = float(value)
+        if math.isnan(value):
+            return
+        if len(self.values) == self.window:
+            self._remove(self.values.popleft())
+        self._add(value)
+        self.updates += 1
+        if self.updates % (self.window * 16) == 0:
+            self._resync()
+
+    def replace_last(self, value):
+        if math.isnan(float(value)):
+            return
+        if self.values:
+            self._remove(self.values.pop())
+        self.push(value)
+
+    def update(self, key, value):
+        if self.last_key is not None and key < self.last_key:
+            return False
+        if key == self.last_key:
+            self.replace_last(value)
+        else:
+            self.push(value)
+        self.last_key = key
+        return True
+
+    def extend(self, values):
+        for value in values:
+            self.push(value)
+
+    @property
+    def variance(self):
+        count = len(self.values)
+        if count < 2:
+            return None
+        return max(self.m2, 0.0) / (count - 1)
+
+    @property
+    def std(self):
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    def zscore(self, value=None):
+        if len(self.values) < self.min_count:
+            return None
+        std = self.std
+        if not std:
+            return None
+        value = self.values[-1] if value is None else value
+        return (value - self.mean) / std
+
+
+def push_series(stats, keys, values):
+    keys = np.asarray(keys)
+    values = np.asarray(values, dtype=np.float64)
+    if stats.last_key is None:
+        start = max(0, len(values) - stats.window)
+    else:
+        start = int(np.searchsorted(keys, stats.last_key, side="left"))
+    for key, value in zip(keys[start:].tolist(), values[start:].tolist()):
+        if math.isfinite(value):
+            stats.update(key, value)
+    return stats
+
+
+def push_returns(stats, keys, closes):
+    closes = np.asarray(closes, dtype=np.float64)
+    if len(closes) < 2:
+        return stats
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.log(closes[1:] / closes[:-1])
+    return push_series(stats, np.asarray(keys)[1:], returns)
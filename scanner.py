@@ -0,0 +1,206 @@
+import argparse
+import concurrent.futures
+import json
+import sys
+
+import numpy as np
+import yfinance as yf
+
+from batch_signals import ACTIONS, CROSSOVERS, indicators_batch, score_batch
+
+DEFAULT_UNIVERSE = [
+    {"name": "S&P 500", "underlying": "^GSPC", "volatility": "^VIX", "term": "^VIX3M"},
+    {"name": "Nasdaq 100", "underlying": "^NDX", "volatility": "^VXN"},
+    {"name": "Russell 2000", "underlying": "^RUT", "volatility": "^RVX"},
+    {"name": "Dow Jones", "underlying": "^DJI", "volatility": "^VXD"},
+    {"name": "Materials", "underlying": "XLB"},
+    {"name": "Communication Services", "underlying": "XLC"},
+    {"name": "Energy", "underlying": "XLE"},
+    {"name": "Financials", "underlying": "XLF"},
+    {"name": "Industrials", "underlying": "XLI"},
+    {"name": "Technology", "underlying": "XLK"},
+    {"name": "Consumer Staples", "underlying": "XLP"},
+    {"name": "Real Estate", "underlying": "XLRE"},
+    {"name": "Utilities", "underlying": "XLU"},
+    {"name": "Health Care", "underlying": "XLV"},
+    {"name": "Consumer Discretionary", "underlying": "XLY"},
+]
+
+
+def load_universe(path):
+    with open(path, "r") as f:
+        universe = json.load(f)
+    for entry in universe:
+        entry.setdefault("name", entry["underlying"])
+    return universe
+
+
+def volatility_ratio(entry, closes, baseline_days=63, short_days=20):
+    volatility = entry.get("volatility")
+    term = entry.get("term")
+
+    if volatility and term:
+        near = closes.get(volatility)
+        far = closes.get(term)
+        if near is None or far is None or len(near) == 0 or len(far) == 0:
+            return np.nan
+        return near[-1] / far[-1] if near[-1] > 0 and far[-1] > 0 else np.nan
+
+    if volatility:
+        series = closes.get(volatility)
+        if series is None or len(series) < baseline_days:
+            return np.nan
+        return series[-1] / series[-baseline_days:].mean()
+
+    prices = closes.get(entry["underlying"])
+    if prices is None or len(prices) < baseline_days + 1:
+        return np.nan
+    returns = np.diff(np.log(prices[-(baseline_days + 1) :]))
+    baseline = returns.std()
+    return returns[-short_days:].std() / baseline if baseline > 0 else np.nan
+
+
+class UniverseScanner:
+    def __init__(self, universe=None, provider=None, period="1y", max_workers=16):
+        self.universe = universe or DEFAULT_UNIVERSE
+        self.provider = provider or yf
+        self.period = period
+        self.max_workers = max_workers
+
+    def symbols(self):
+        symbols = []
+        for entry in self.universe:
+            for key in ("underlying", "volatility", "term"):
+                symbol = entry.get(key)
+                if symbol and symbol not in symbols:
+                    symbols.append(symbol)
+        return symbols
+
+    def fetch(self, symbols):
+        if hasattr(self.provider, "download"):
+            return self.fetch_batched(symbols)
+        return self.fetch_parallel(symbols)
+
+    def fetch_batched(self, symbols):
+        data = self.provider.download(
+            symbols,
+            period=self.period,
+            group_by="ticker",
+            threads=self.max_workers,
+            progress=False,
+            auto_adjust=True,
+        )
+
+        closes = {}
+        for symbol in symbols:
+            try:
+                if len(symbols) == 1 and "Close" in data.columns:
+                    series = data["Close"]
+                else:
+                    series = data[symbol]["Close"]
+                values = series.dropna().to_numpy(dtype=np.float64)
+                if len(values) > 0:
+                    closes[symbol] = values
+            except KeyError:
+                print(f"No data available for {symbol}")
+        return closes
+
+    def fetch_parallel(self, symbols):
+        def fetch_one(symbol):
+            data = self.provider.Ticker(symbol).history(period=self.period)
+            return data["Close"].dropna().to_numpy(dtype=np.float64)
+
+        closes = {}
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="scanner-fetch"
+        ) as executor:
+            futures = {executor.submit(fetch_one, s): s for s in symbols}
+            for future in concurrent.futures.as_completed(futures):
+                symbol = futures[future]
+                try:
+                    values = future.result()
+                    if len(values) > 0:
+                        closes[symbol] = values
+                except Exception as e:
+                    print(f"Error fetching {symbol}: {e}")
+        return closes
+
+    def scan(self, closes=None):
+        if closes is None:
+            closes = self.fetch(self.symbols())
+
+        entries = []
+        ratios = []
+        for entry in self.universe:
+            prices = closes.get(entry["underlying"])
+            ratio = volatility_ratio(entry, closes)
+            if prices is None or np.isnan(ratio):
+                continue
+            entries.append(entry)
+            ratios.append(ratio)
+
+        if not entries:
+            return []
+
+        indicators = indicators_batch([closes[e["underlying"]] for e in entries])
+        scores = score_batch(
+            ratios, indicators["rsi"], indicators["crossover"], indicators["above_ma"]
+        )
+
+        order = np.lexsort((-scores["confidence"], -scores["entry_score"]))
+        crossover_names = {code: name for name, code in CROSSOVERS.items()}
+
+        results = []
+        for i in order:
+            rsi = indicators["rsi"][i]
+            ma = indicators["ma"][i]
+            results.append(
+                {
+                    "name": entries[i]["name"],
+                    "underlying": entries[i]["underlying"],
+                    "price": float(indicators["last"][i]),
+                    "ratio": float(ratios[i]),
+                    "rsi": None if np.isnan(rsi) else float(rsi),
+                    "macd_crossover": crossover_names[int(indicators["crossover"][i])],
+                    "ma200": None if np.isnan(ma) else float(ma),
+                    "above_ma200": bool(indicators["above_ma"][i]),
+                    "action": ACTIONS[scores["action"][i]],
+                    "entry_score": int(scores["entry_score"][i]),
+                    "confidence": int(scores["confidence"][i]),
+                    "entry_signals": int(scores["entry_signals"][i]),
+                }
+            )
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contrarian Edge universe scanner")
+    parser.add_argument("--universe", help="JSON file with universe entries")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    universe = load_universe(args.universe) if args.universe else None
+    scanner = UniverseScanner(universe, period=args.period, max_workers=args.workers)
+    results = scanner.scan()[: args.top]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(
+        f"{'Instrument':<26} {'Ratio':>7} {'RSI':>6} {'Score':>6} {'Conf':>5}  Action"
+    )
+    for r in results:
+        rsi = f"{r['rsi']:.1f}" if r["rsi"] is not None else "--"
+        print(
+            f"{r['name']:<26} {r['ratio']:>7.3f} {rsi:>6} {r['entry_score']:>6} "
+            f"{r['confidence']:>4}%  {r['action']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
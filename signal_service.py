@@ -0,0 +1,252 @@
+import argparse
+import hashlib
+import json
+import sys
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from clock import Schedule, get_clock
+from data_quality import DATA_QUALITY
+from monitor import ContrarianMonitor
+from ring_buffer import RatioHistory
+from signal_stream import SignalStreamServer
+
+
+class SignalService:
+    def __init__(self, monitor, refresh_interval=60, history_length=60):
+        self.monitor = monitor
+        self.refresh_interval = refresh_interval
+        self.ratio_history = RatioHistory(capacity=history_length)
+        self.snapshot = {}
+        self.state = {}
+        self.listeners = []
+        self.last_fingerprint = None
+        self.last_refresh = None
+        self.last_change = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        if len(self.ratio_history) == 0:
+            dates, ratios = self.monitor.fetch_ratio_history(
+                limit=self.ratio_history.capacity
+            )
+            self.ratio_history.extend(dates, ratios)
+
+        market_data = self.monitor.fetch_market_data()
+        if not market_data or self.monitor.snapshots.stale:
+            print("Failed to fetch market data, serving previous snapshot")
+            return False
+
+        self.last_refresh = get_clock().now()
+
+        self.ratio_history.append(
+            date.fromisoformat(market_data["bar_date"]), market_data["ratio"]
+        )
+
+        fingerprint = (
+            tuple(sorted(market_data.items())),
+            self.ratio_history.version,
+        )
+        if fingerprint == self.last_fingerprint:
+            return False
+
+        self.last_fingerprint = fingerprint
+        self.last_change = self.last_refresh
+        self.snapshot = self.build_snapshot(market_data)
+
+        for listener in list(self.listeners):
+            try:
+                listener(self.state, self.history_payload())
+            except Exception as e:
+                print(f"Error notifying signal listener: {e}")
+        return True
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def history_payload(self):
+        return {
+            "dates": [d.isoformat() for d in self.ratio_history.dates()],
+            "ratios": self.ratio_history.values().tolist(),
+        }
+
+    def build_snapshot(self, market_data):
+        action, entry_score, confidence, color, signals, entry_signals = (
+            self.monitor.evaluate_signal(market_data)
+        )
+        as_of = self.last_change.isoformat(timespec="seconds")
+
+        self.state = {
+            "vix_price": market_data["vix_price"],
+            "vix_prev": market_data["vix_prev"],
+            "vix3m_price": market_data["vix3m_price"],
+            "vix3m_prev": market_data["vix3m_prev"],
+            "spy_price": market_data["spy_price"],
+            "spy_prev": market_data["spy_prev"],
+            "ratio": market_data["ratio"],
+            "bar_date": market_data["bar_date"],
+            "rsi": market_data["rsi"],
+            "macd_line": market_data["macd_line"],
+            "signal_line": market_data["signal_line"],
+            "macd_crossover": market_data["macd_crossover"],
+            "above_ma200": market_data["above_ma200"],
+            "ma200_value": market_data["ma200_value"],
+            "action": action,
+            "entry_score": entry_score,
+            "confidence": confidence,
+            "color": color,
+            "entry_signals": entry_signals,
+        }
+
+        payloads = {
+            "/signal": {
+                "action": action,
+                "entry_score": entry_score,
+                "confidence": confidence,
+                "color": color,
+                "entry_signals": entry_signals,
+                "signals": signals,
+                "ratio": market_data["ratio"],
+                "as_of": as_of,
+            },
+            "/indicators": {
+                "vix": market_data["vix_price"],
+                "vix3m": market_data["vix3m_price"],
+                "spx": market_data["spy_price"],
+                "ratio": market_data["ratio"],
+                "rsi": market_data["rsi"],
+                "macd_line": market_data["macd_line"],
+                "signal_line": market_data["signal_line"],
+                "macd_crossover": market_data["macd_crossover"],
+                "ma200": market_data["ma200_value"],
+                "above_ma200": market_data["above_ma200"],
+                "as_of": as_of,
+            },
+            "/ratio-history": {**self.history_payload(), "as_of": as_of},
+            "/quality": {
+                **DATA_QUALITY.stats(),
+                "recent_quarantine": list(DATA_QUALITY.quarantine)[-50:],
+                "recent_warnings": list(DATA_QUALITY.warnings)[-50:],
+                "as_of": as_of,
+            },
+        }
+
+        snapshot = {}
+        for path, payload in payloads.items():
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            snapshot[path] = (body, etag)
+        return snapshot
+
+    def get(self, path):
+        return self.snapshot.get(path)
+
+    def _run(self):
+        schedule = Schedule(self.refresh_interval)
+        while not get_clock().sleep(schedule.due_in(), self._stop_event):
+            schedule.mark_run()
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing signal snapshot: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="signal-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class SignalRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ContrarianEdge/1.0"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        service = self.server.service
+
+        if path not in ("/signal", "/indicators", "/ratio-history", "/quality"):
+            self.send_json(404, {"error": f"Unknown endpoint {path}"})
+            return
+
+        entry = service.get(path)
+        if entry is None:
+            self.send_json(503, {"error": "Snapshot not ready yet"})
+            return
+
+        body, etag = entry
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", f"max-age={service.refresh_interval}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(service, host="127.0.0.1", port=8765):
+    server = ThreadingHTTPServer((host, port), SignalRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contrarian Edge signal service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=int, default=60)
+    parser.add_argument("--stream-port", type=int)
+    parser.add_argument("--bars", choices=["1d", "1m", "5m"], default="1d")
+    args = parser.parse_args(argv)
+
+    service = SignalService(
+        ContrarianMonitor(notify=False, interval=args.bars),
+        refresh_interval=args.interval,
+    )
+    service.start()
+    server = create_server(service, args.host, args.port)
+    print(f"Serving signals on http://{args.host}:{args.port}")
+
+    try:
+        if args.stream_port:
+            threading.Thread(
+                target=server.serve_forever, name="signal-http", daemon=True
+            ).start()
+            SignalStreamServer(service, args.host, args.stream_port).run()
+        else:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
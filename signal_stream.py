@@ -0,0 +1,217 @@
+import asyncio
+import json
+import threading
+
+import requests
+
+from clock import get_clock
+
+
+def encode_chunk(data):
+    return b"%x\r\n%s\r\n" % (len(data), data)
+
+
+def encode_event(event, version, payload):
+    data = json.dumps(payload, separators=(",", ":"))
+    return encode_chunk(f"id: {version}\nevent: {event}\ndata: {data}\n\n".encode())
+
+
+PING_CHUNK = encode_chunk(b": ping\n\n")
+
+
+class SignalBroadcaster:
+    def __init__(self):
+        self.version = 0
+        self.state = {}
+        self.history = None
+        self.snapshot_event = None
+        self.diff_event = None
+        self._changed = None
+
+    def bind(self):
+        self._changed = asyncio.Event()
+
+    def publish(self, state, history):
+        diff = {k: v for k, v in state.items() if self.state.get(k) != v}
+        if not diff and history == self.history:
+            return False
+
+        self.version += 1
+        self.state = dict(state)
+        self.history = history
+        self.snapshot_event = encode_event(
+            "snapshot", self.version, {"state": self.state, "history": history}
+        )
+        payload = dict(diff)
+        if history is not None and history["ratios"]:
+            payload["history_tail"] = [history["dates"][-1], history["ratios"][-1]]
+        self.diff_event = encode_event("diff", self.version, payload)
+
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return True
+
+    async def wait_for_change(self, version, timeout):
+        if self.version != version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class SignalStreamServer:
+    def __init__(self, service, host="127.0.0.1", port=8766, heartbeat=15):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.heartbeat = heartbeat
+        self.broadcaster = SignalBroadcaster()
+        self.clients = 0
+        self.loop = None
+
+    def on_update(self, state, history):
+        self.loop.call_soon_threadsafe(self.broadcaster.publish, state, history)
+
+    async def handle_client(self, reader, writer):
+        self.clients += 1
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+            lines = request.decode("latin-1").split("\r\n")
+            method, path = lines[0].split(" ")[:2]
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+
+            if method != "GET" or path.split("?", 1)[0] != "/stream":
+                writer.write(
+                    b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n"
+                    b"Connection: close\r\n\r\n"
+                )
+                await writer.drain()
+                return
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n" + encode_chunk(b"retry: 5000\n\n")
+            )
+
+            broadcaster = self.broadcaster
+            last_event_id = headers.get("last-event-id")
+            version = broadcaster.version
+            if broadcaster.snapshot_event is not None and last_event_id != str(version):
+                writer.write(broadcaster.snapshot_event)
+            await writer.drain()
+
+            while True:
+                changed = await broadcaster.wait_for_change(version, self.heartbeat)
+                if not changed:
+                    writer.write(PING_CHUNK)
+                elif broadcaster.version == version + 1:
+                    writer.write(broadcaster.diff_event)
+                else:
+                    writer.write(broadcaster.snapshot_event)
+                version = broadcaster.version
+                await writer.drain()
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            asyncio.TimeoutError,
+            ConnectionError,
+            ValueError,
+        ):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.broadcaster.bind()
+        if self.service.state:
+            self.broadcaster.publish(self.service.state, self.service.history_payload())
+        self.service.add_listener(self.on_update)
+
+        server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, limit=8192
+        )
+        print(f"Streaming signal updates on http://{self.host}:{self.port}/stream")
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        asyncio.run(self.serve())
+
+
+class SignalStreamClient:
+    def __init__(self, url, on_snapshot, on_diff, reconnect_delay=5):
+        self.url = url
+        self.on_snapshot = on_snapshot
+        self.on_diff = on_diff
+        self.reconnect_delay = reconnect_delay
+        self.last_event_id = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="signal-stream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._consume()
+            except Exception as e:
+                print(f"Signal stream disconnected: {e}")
+            get_clock().sleep(self.reconnect_delay, self._stop_event)
+
+    def _consume(self):
+        headers = {"Accept": "text/event-stream"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+
+        with requests.get(self.url, headers=headers, stream=True, timeout=(5, 60)) as r:
+            r.raise_for_status()
+            event = "message"
+            data = []
+            event_id = None
+            for line in r.iter_lines(chunk_size=None, decode_unicode=True):
+                if self._stop_event.is_set():
+                    return
+                if line is None:
+                    continue
+                if line == "":
+                    if data:
+                        self._dispatch(event, "\n".join(data))
+                        if event_id is not None:
+                            self.last_event_id = event_id
+                    event = "message"
+                    data = []
+                    event_id = None
+                elif line.startswith(":"):
+                    continue
+                else:
+                    field, _, value = line.partition(":")
+                    value = value[1:] if value.startswith(" ") else value
+                    if field == "event":
+                        event = value
+                    elif field == "data":
+                        data.append(value)
+                    elif field == "id":
+                        event_id = value
+
+    def _dispatch(self, event, data):
+        payload = json.loads(data)
+        if event == "snapshot":
+            self.on_snapshot(payload["state"], payload["history"])
+        elif event == "diff":
+            self.on_diff(payload)
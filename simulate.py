@@ -0,0 +1,311 @@
+import argparse
+import contextlib
+import io
+import itertools
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmark import (
+    PERIOD_ROWS,
+    OfflineMonitor,
+    ReplayProvider,
+    ReplayTicker,
+    generate_synthetic_dataset,
+    load_recorded_dataset,
+)
+from batch_signals import ACTIONS, CROSSOVERS, score_batch
+from clock import SimulatedClock, get_clock, use_clock
+from data_quality import DATA_QUALITY
+from indicator_cache import INDICATOR_CACHE
+from resilience import Deadline, ResilientFetcher, get_fetcher
+from term_structure import TERM_CACHE
+
+MARKET_TZ = "America/New_York"
+SESSION_OPEN = 9.5 * 3600
+SESSION_CLOSE = 16 * 3600
+
+
+def market_now():
+    return pd.Timestamp(get_clock().time(), unit="s", tz="UTC").tz_convert(MARKET_TZ)
+
+
+def session_progress(now):
+    seconds = now.hour * 3600 + now.minute * 60 + now.second
+    progress = (seconds - SESSION_OPEN) / (SESSION_CLOSE - SESSION_OPEN)
+    return min(1.0, max(0.0, progress))
+
+
+class SessionTicker(ReplayTicker):
+    def history(self, period=None, start=None, end=None, interval="1d"):
+        market = self.provider
+        now = market_now()
+        if market.failing(self.symbol, now):
+            market.injected += 1
+            raise ConnectionError(f"Simulated outage fetching {self.symbol}")
+
+        progress = session_progress(now)
+        market.as_of = (
+            now if progress > 0 else now.normalize() - pd.Timedelta(seconds=1)
+        )
+        frame = market.frames.get(self.symbol)
+        if frame is None or period not in PERIOD_ROWS or interval != "1d":
+            frame = super().history(period, start, end, interval)
+        else:
+            stop = frame.index.searchsorted(market.as_of, side="right")
+            frame = frame.iloc[max(0, stop - PERIOD_ROWS[period]) : stop]
+        if (
+            progress >= 1
+            or len(frame) < 2
+            or frame.index[-1].normalize() != now.normalize()
+        ):
+            return frame
+
+        closes = frame["Close"].to_numpy(dtype=float).copy()
+        closes[-1] = round(closes[-2] + (closes[-1] - closes[-2]) * progress, 2)
+        return frame.assign(Close=closes)
+
+
+class SimulatedMarket(ReplayProvider):
+    def __init__(self, frames, failure_rate=0.0, outages=(), seed=47):
+        super().__init__(frames)
+        self.failure_rate = failure_rate
+        self.outages = list(outages)
+        self.seed = seed
+        self.rngs = {}
+        self.injected = 0
+
+    def failing(self, symbol, now):
+        if any(start <= now < end for start, end in self.outages):
+            return True
+        if not self.failure_rate:
+            return False
+        if symbol not in self.rngs:
+            self.rngs[symbol] = random.Random(f"{self.seed}:{symbol}")
+        return self.rngs[symbol].random() < self.failure_rate
+
+    def Ticker(self, symbol):
+        return SessionTicker(self, symbol)
+
+
+class SimulatedMonitor(OfflineMonitor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cycles = 0
+        self.failed = 0
+        self.cycle_seconds = 0.0
+        self.transitions = []
+        self.notifications = []
+
+    def check_and_notify(self):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok = super().check_and_notify()
+        self.cycle_seconds += time.perf_counter() - start
+        self.cycles += 1
+
+        action = self.signal_memo[1][0] if ok and self.signal_memo else "FAILED"
+        if not ok:
+            self.failed += 1
+        if not self.transitions or self.transitions[-1][1] != action:
+            self.transitions.append((market_now(), action))
+        return ok
+
+    def send_telegram_notification(self, signal_type, *args, **kwargs):
+        self.notifications.append((market_now(), signal_type))
+        return True
+
+
+def default_start(frames):
+    last = frames["^GSPC"].index[-1].tz_convert(MARKET_TZ).normalize()
+    return last - pd.Timedelta(days=last.weekday() + 7)
+
+
+def simulate(frames, start, days=5, every=60, failure_rate=0.0, outages=(), seed=47):
+    INDICATOR_CACHE.clear()
+    TERM_CACHE.clear()
+    clock = SimulatedClock(start.timestamp())
+    market = SimulatedMarket(frames, failure_rate, outages, seed)
+
+    with use_clock(clock):
+        monitor = SimulatedMonitor(provider=market)
+        fetcher = get_fetcher(market)
+        started = time.perf_counter()
+        monitor.run(every, cycles=int(days * 86400 // every))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "monitor": monitor,
+        "market": market,
+        "virtual_seconds": clock.time() - start.timestamp(),
+        "real_seconds": elapsed,
+        "fetcher": fetcher.stats(),
+        "indicator_cache": INDICATOR_CACHE.stats(),
+        "term_cache": TERM_CACHE.stats(),
+        "data_quality": DATA_QUALITY.stats(),
+    }
+
+
+def print_report(result, every):
+    monitor = result["monitor"]
+    real = result["real_seconds"]
+    virtual = result["virtual_seconds"]
+    print(
+        f"Simulated {virtual / 86400:.1f} days ({monitor.cycles:,} cycles every "
+        f"{every:g}s) in {real:.2f}s real time ({virtual / max(real, 1e-9):,.0f}x, "
+        f"{monitor.cycle_seconds / max(monitor.cycles, 1) * 1000:.2f} ms/cycle)"
+    )
+
+    print("Signal changes:")
+    for when, action in monitor.transitions:
+        print(f"  {when:%a %Y-%m-%d %H:%M}  {action}")
+    print(f"Notifications sent: {len(monitor.notifications)}")
+    for when, signal_type in monitor.notifications:
+        print(f"  {when:%a %Y-%m-%d %H:%M}  {signal_type}")
+
+    print(
+        f"Market data memo hits: {monitor.memo_hits:,}/{monitor.cycles:,} cycles, "
+        f"{monitor.failed:,} failed cycles"
+    )
+    for name in ("indicator_cache", "term_cache"):
+        stats = result[name]
+        print(
+            f"{name.replace('_', ' ').capitalize()}: {stats['hits']:,} hits, "
+            f"{stats['misses']:,} misses, {stats['evictions']:,} evictions "
+            f"({stats['hit_rate']:.0%} hit rate)"
+        )
+    fetcher = result["fetcher"]
+    print(
+        f"Fetcher: {result['market'].injected:,} injected failures, "
+        f"{fetcher['backoffs']:,} backoffs ({fetcher['backoff_seconds']:.1f}s "
+        f"virtual), {fetcher['fallbacks']:,} fallbacks, breaker {fetcher['breaker']}"
+    )
+    quality = result["data_quality"]
+    print(
+        f"Data quality: {quality['checked']:,} bars checked, "
+        f"{quality['quarantined']:,} quarantined, {quality['warnings']:,} warnings"
+    )
+
+
+def check_breaker_recovers_after_expired_probe():
+    clock = SimulatedClock(0)
+    with use_clock(clock), contextlib.redirect_stdout(io.StringIO()):
+        fetcher = ResilientFetcher("check", retries=1)
+        fetcher.last_good["bars"] = "old"
+        for _ in range(fetcher.breaker.failure_threshold):
+            fetcher.call("bars", lambda: None)
+        clock.advance(fetcher.breaker.reset_timeout)
+        fetcher.call("bars", lambda: "new", Deadline(0))
+        clock.advance(1000)
+        return fetcher.call("bars", lambda: "new") == "new"
+
+
+def check_scoring_parity():
+    monitor = OfflineMonitor(provider=ReplayProvider({}))
+    grid = list(
+        itertools.product(
+            (0.85, 0.97, 1.02, 1.07, 1.15),
+            (None, 25, 35, 45, 60, 75),
+            tuple(CROSSOVERS),
+            (True, False),
+            (None, -1.5, 0.0, 2.5),
+            (None, -2.5, 0.0),
+            (None, 0.0, 0.08),
+        )
+    )
+    expected = [
+        monitor.calculate_enhanced_signal(
+            ratio, 20.0, rsi, crossover, above, 500.0, 480.0, *extras
+        )
+        for ratio, rsi, crossover, above, *extras in grid
+    ]
+    columns = list(zip(*grid))
+    scores = score_batch(
+        columns[0],
+        [np.nan if v is None else v for v in columns[1]],
+        [CROSSOVERS[name] for name in columns[2]],
+        columns[3],
+        *([np.nan if v is None else v for v in column] for column in columns[4:]),
+    )
+    return all(
+        (action, entry_score, confidence, entry_signals)
+        == (
+            ACTIONS[scores["action"][i]],
+            scores["entry_score"][i],
+            scores["confidence"][i],
+            scores["entry_signals"][i],
+        )
+        for i, (action, entry_score, confidence, _, _, entry_signals) in enumerate(
+            expected
+        )
+    )
+
+
+CHECKS = (check_breaker_recovers_after_expired_probe, check_scoring_parity)
+
+
+def run_checks():
+    failed = 0
+    for check in CHECKS:
+        ok = check()
+        failed += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {check.__name__}")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run monitor cycles against replayed data on a simulated clock"
+    )
+    parser.add_argument("--dataset", default="synthetic")
+    parser.add_argument("--start", help="first simulated day (default: last full week)")
+    parser.add_argument("--days", type=float, default=5)
+    parser.add_argument("--every", type=float, default=60)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--outage",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("START", "MINUTES"),
+        help="fail every fetch from START (e.g. 2025-06-25T10:00) for MINUTES",
+    )
+    parser.add_argument("--seed", type=int, default=47)
+    parser.add_argument("--check", action="store_true", help="run regression checks")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return run_checks()
+
+    if args.dataset == "synthetic":
+        frames = generate_synthetic_dataset()
+    else:
+        frames = load_recorded_dataset(args.dataset)
+
+    if args.start:
+        start = pd.Timestamp(args.start, tz=MARKET_TZ)
+    else:
+        start = default_start(frames)
+    outages = []
+    for begin, minutes in args.outage:
+        begin = pd.Timestamp(begin, tz=MARKET_TZ)
+        outages.append((begin, begin + pd.Timedelta(minutes=float(minutes))))
+
+    result = simulate(
+        frames,
+        start,
+        args.days,
+        args.every,
+        args.failure_rate,
+        outages,
+        args.seed,
+    )
+    print_report(result, args.every)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+from clock import get_clock
+
+
+class Snapshot:
+    def __init__(self, data, fetched_at=None):
+        self.data = data
+        self.fetched_at = get_clock().time() if fetched_at is None else fetched_at
+
+    @property
+    def age(self):
+        return get_clock().time() - self.fetched_at
+
+    def describe_age(self):
+        age = self.age
+        if age < 90:
+            return f"{age:.0f}s ago"
+        if age < 5400:
+            return f"{age / 60:.0f}m ago"
+        if age < 172800:
+            return f"{age / 3600:.0f}h ago"
+        return f"{age / 86400:.0f}d ago"
+
+
+class SnapshotStore:
+    def __init__(self, loader, path=None, name="snapshot"):
+        self.loader = loader
+        self.path = Path(path) if path is not None else None
+        self.name = name
+        self.snapshot = None
+        self.last_error = None
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        if self.path is not None:
+            self.load()
+
+    def current(self):
+        return self.snapshot
+
+    @property
+    def stale(self):
+        return self.last_error is not None
+
+    def refresh(self):
+        with self._refresh_lock:
+            try:
+                data = self.loader()
+            except Exception as e:
+                return self.update(None, e)
+            return self.update(data)
+
+    def update(self, data, error=None):
+        if data is None:
+            self.last_error = error or ValueError(
+                f"{self.name} loader returned no data"
+            )
+            if self.snapshot is not None:
+                print(
+                    f"Refreshing {self.name} failed ({self.last_error}), serving "
+                    f"snapshot from {self.snapshot.describe_age()}"
+                )
+            return self.snapshot
+
+        self.last_error = None
+        if self.snapshot is None or data is not self.snapshot.data:
+            self.snapshot = Snapshot(data)
+            self.save()
+        else:
+            self.snapshot.fetched_at = get_clock().time()
+        return self.snapshot
+
+    def refresh_async(self, callback=None):
+        if self._thread is not None and self._thread.is_alive():
+            return False
+
+        def run():
+            snapshot = self.refresh()
+            if callback is not None:
+                callback(snapshot, self.last_error)
+
+        self._thread = threading.Thread(
+            target=run, name=f"{self.name}-refresh", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def get(self, max_age=60, callback=None):
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.age > max_age:
+            self.refresh_async(callback)
+        return snapshot
+
+    def save(self):
+        if self.path is None:
+            return False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {
+                        "fetched_at": self.snapshot.fetched_at,
+                        "data": self.snapshot.data,
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            print(f"Error saving {self.name} to {self.path}: {e}")
+            return False
+
+    def load(self):
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+            self.snapshot = Snapshot(stored["data"], stored["fetched_at"])
+            return True
+        except Exception as e:
+            print(f"Error loading {self.name} from {self.path}: {e}")
+            return False
@@ -0,0 +1,151 @@
+import concurrent.futures
+
+import numpy as np
+
+from bars import as_bars
+from indicator_cache import IndicatorCache
+from resilience import get_fetcher, upstream_provider
+
+TERM_STRUCTURE = (
+    ("^VIX9D", 9),
+    ("^VIX", 30),
+    ("^VIX3M", 93),
+    ("^VIX6M", 183),
+    ("^VIX1Y", 365),
+)
+TERM_SYMBOLS = tuple(symbol for symbol, _ in TERM_STRUCTURE)
+TERM_DAYS = np.array([days for _, days in TERM_STRUCTURE], dtype=np.float64)
+TERM_CACHE = IndicatorCache(maxsize=8, max_age=300)
+
+
+def fetch_term_bars(provider, period="1y", symbols=TERM_SYMBOLS):
+    if hasattr(provider, "download"):
+        data = provider.download(
+            list(symbols),
+            period=period,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+            auto_adjust=True,
+        )
+        curve = {}
+        for symbol in symbols:
+            try:
+                bars = as_bars(data[symbol]).dropna()
+            except KeyError:
+                print(f"No data available for {symbol}")
+                continue
+            if not bars.empty:
+                curve[symbol] = bars
+        return curve
+
+    def fetch_one(symbol):
+        return as_bars(provider.Ticker(symbol).history(period=period)).dropna()
+
+    curve = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(symbols), thread_name_prefix="term-fetch"
+    ) as executor:
+        futures = {executor.submit(fetch_one, s): s for s in symbols}
+        for future in concurrent.futures.as_completed(futures):
+            symbol = futures[future]
+            try:
+                bars = future.result()
+                if not bars.empty:
+                    curve[symbol] = bars
+            except Exception as e:
+                print(f"Error fetching {symbol}: {e}")
+    return curve
+
+
+def align_term_structure(curve_bars, symbols=TERM_SYMBOLS):
+    columns = []
+    for symbol in symbols:
+        bars = curve_bars.get(symbol)
+        if bars is None:
+            columns.append((np.empty(0, dtype=np.int64), np.empty(0)))
+            continue
+        columns.append((bars.days, bars.closes))
+    days = np.unique(np.concatenate([ordinals for ordinals, _ in columns]))
+    curve = np.full((len(days), len(symbols)), np.nan)
+    for j, (ordinals, closes) in enumerate(columns):
+        curve[np.searchsorted(days, ordinals), j] = closes
+
+    anchors = [symbols.index(s) for s in ("^VIX", "^VIX3M") if s in symbols]
+    keep = np.isfinite(curve[:, anchors]).all(axis=1)
+    return days[keep], curve[keep]
+
+
+def term_metrics(curve, tenors=TERM_DAYS):
+    curve = np.where(curve > 0, curve, np.nan)
+    valid = np.isfinite(curve)
+    weights = valid.astype(np.float64)
+    values = np.where(valid, curve, 0.0)
+    x = np.log(tenors)[None, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        count = weights.sum(axis=1)
+        x_mean = (weights * x).sum(axis=1) / count
+        y_mean = values.sum(axis=1) / count
+        dx = (x - x_mean[:, None]) * weights
+        slope = (dx * (values - y_mean[:, None])).sum(axis=1) / (dx * dx).sum(axis=1)
+
+        front = curve[:, :-1]
+        back = curve[:, 1:]
+        pairs = np.isfinite(front) & np.isfinite(back)
+        spread = np.where(pairs, front / back - 1.0, -np.inf)
+        inversion = np.maximum(spread.max(axis=1), 0.0)
+        inversion[~pairs.any(axis=1)] = np.nan
+        inverted_pairs = (spread > 0).sum(axis=1)
+
+        near, mid, far = (curve[:, TERM_SYMBOLS.index(s)] for s in TERM_SYMBOLS[1:4])
+        curvature = (2.0 * mid - near - far) / mid
+
+    slope[count < 2] = np.nan
+    return {
+        "slope": slope,
+        "inversion": inversion,
+        "inverted_pairs": inverted_pairs,
+        "curvature": curvature,
+    }
+
+
+def load_term_structure(provider, period="1y", deadline=None):
+    def load():
+        curve_bars = get_fetcher(provider, "term").call(
+            f"term:{period}",
+            lambda: fetch_term_bars(provider, period) or None,
+            deadline,
+        )
+        days, curve = align_term_structure(curve_bars)
+        return days, curve, term_metrics(curve)
+
+    return TERM_CACHE.get_or_compute(
+        ("term", upstream_provider(provider), period), load
+    )
+
+
+def latest_term_metrics(provider, period="1y", deadline=None):
+    try:
+        days, curve, metrics = load_term_structure(provider, period, deadline)
+    except Exception as e:
+        print(f"Error loading VIX term structure: {e}")
+        days = []
+    if len(days) == 0:
+        return {
+            "term_slope": None,
+            "term_inversion": None,
+            "term_curvature": None,
+            "term_inverted_pairs": None,
+        }
+
+    def last(name):
+        value = float(metrics[name][-1])
+        return None if np.isnan(value) else value
+
+    return {
+        "term_slope": last("slope"),
+        "term_inversion": last("inversion"),
+        "term_curvature": last("curvature"),
+        "term_inverted_pairs": int(metrics["inverted_pairs"][-1]),
+    }